@@ -0,0 +1,104 @@
+import argparse
+import threading
+import time
+from rooms import RoomRegistry
+
+class Sink:
+    """Stand-in for ClientConnection: enqueue only counts, so we time the fan-out itself"""
+
+    def __init__(self):
+        self.rooms = set()
+        self.received = 0
+
+    def enqueue(self, data, wait=True):
+        self.received += 1
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+def run_threads(worker, threads):
+    """Run worker(index) in parallel threads and return all recorded latencies"""
+    results = [[] for _ in range(threads)]
+    pool = [threading.Thread(target=worker, args=(i, results[i])) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sorted(latency for latencies in results for latency in latencies)
+
+def bench_global(users, threads, broadcasts):
+    """Old design: one dict, one lock, every message goes to every user"""
+    clients = {Sink(): 'user' for _ in range(users)}
+    lock = threading.Lock()
+    data = b'x' * 64
+
+    def worker(index, latencies):
+        for _ in range(broadcasts):
+            start = time.perf_counter()
+            with lock:
+                for client in clients:
+                    client.enqueue(data)
+            latencies.append(time.perf_counter() - start)
+
+    return run_threads(worker, threads)
+
+def bench_rooms(users, room_size, threads, broadcasts, shards):
+    """Sharded registry: each message only reaches its room's members"""
+    registry = RoomRegistry(shards)
+    room_count = max(1, users // room_size)
+    for i in range(users):
+        client = Sink()
+        registry.add(client)
+        registry.join(client, f"room{i % room_count}")
+    data = b'x' * 64
+
+    def worker(index, latencies):
+        # Each thread talks in its own room, and churns membership in another
+        room = f"room{index % room_count}"
+        churn_room = f"room{(index + threads) % room_count}"
+        churner = Sink()
+        for n in range(broadcasts):
+            if n % 4 == 0:
+                registry.join(churner, churn_room)
+                registry.leave(churner, churn_room)
+            start = time.perf_counter()
+            registry.broadcast(room, data)
+            latencies.append(time.perf_counter() - start)
+
+    return run_threads(worker, threads)
+
+def check_spread(users, shards):
+    """Connect users clients and report how evenly they land on the connected shards"""
+    registry = RoomRegistry(shards)
+    for _ in range(users):
+        registry.add(Sink())
+    sizes = registry.connected_sizes()
+    print(f"connected clients per shard ({users} users, {shards} shards): min {min(sizes)}, max {max(sizes)}")
+    if users >= 4 * shards and min(sizes) == 0:
+        raise SystemExit("connected clients do not spread across shards")
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadcast latency vs total users at a fixed room size")
+    parser.add_argument('--room-size', type=int, default=20)
+    parser.add_argument('--users', type=int, nargs='+', default=[100, 1000, 5000, 20000])
+    parser.add_argument('--threads', type=int, default=8, help="Concurrent senders")
+    parser.add_argument('--broadcasts', type=int, default=200, help="Broadcasts per sender")
+    parser.add_argument('--shards', type=int, default=16)
+    args = parser.parse_args()
+
+    check_spread(max(args.users), args.shards)
+    print(f"room size {args.room_size}, {args.threads} senders x {args.broadcasts} broadcasts, latency in microseconds")
+    columns = ['global', 'rooms/1 shard', f'rooms/{args.shards} shards']
+    print(f"{'users':>8}" + ''.join(f"{name + ' p50':>24}{'p99':>8}" for name in columns))
+    for users in args.users:
+        results = [
+            bench_global(users, args.threads, args.broadcasts),
+            bench_rooms(users, args.room_size, args.threads, args.broadcasts, 1),
+            bench_rooms(users, args.room_size, args.threads, args.broadcasts, args.shards),
+        ]
+        row = ''.join(f"{percentile(r, 50) * 1e6:>24.1f}{percentile(r, 99) * 1e6:>8.1f}" for r in results)
+        print(f"{users:>8}" + row)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
+import argparse
 import socket
 import threading
 import sys
+from framing import encode_frame, recv_frame
 
-def receive(sock, username):
+def receive(sock, username, framed=False):
     try:
         while True:
-            data = sock.recv(1024)
-            if not data:
+            data = recv_frame(sock) if framed else sock.recv(1024)
+            if data is None or (not framed and not data):
                 print("\nServer disconnected")
                 sock.close()
                 sys.exit(0)
@@ -22,7 +24,17 @@ def receive(sock, username):
         sock.close()
         sys.exit(0)
 
+def send(sock, text, framed=False):
+    """Send one message, as a length-prefixed frame in framed mode"""
+    data = text.encode()
+    sock.sendall(encode_frame(data) if framed else data)
+
 def main():
+    parser = argparse.ArgumentParser(description="TCP chat client")
+    parser.add_argument('--framed', action='store_true',
+                        help="Use length-prefixed frames so messages are never split or merged")
+    args = parser.parse_args()
+
     HOST = '127.0.0.1'
     PORT = 12345
     
@@ -34,10 +46,10 @@ def main():
         print(f"Connected to server as {username}")
         
         # Send username to server
-        s.sendall(f"USERNAME:{username}".encode())
+        send(s, f"USERNAME:{username}", args.framed)
         
         # Start receive thread
-        threading.Thread(target=receive, args=(s, username), daemon=True).start()
+        threading.Thread(target=receive, args=(s, username, args.framed), daemon=True).start()
         
         # Main send loop
         try:
@@ -46,7 +58,7 @@ def main():
                 if msg.lower() == 'exit':
                     print("Disconnecting...")
                     break
-                s.sendall(msg.encode())
+                send(s, msg, args.framed)
         except KeyboardInterrupt:
             print("\nDisconnecting...")
         finally:
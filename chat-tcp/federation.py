@@ -0,0 +1,118 @@
+import json
+import os
+import socket
+import threading
+
+# Unix datagram sockets keep each relayed event in one message. Larger events
+# (chat frames may be far bigger) are not relayed; they are counted as dropped
+MAX_EVENT = 64 * 1024
+
+class RelayBus:
+    """
+    Local relay bus between chat server processes on one host.
+
+    Every node binds a Unix datagram socket `node-<id>.sock` inside a shared
+    directory and sends each event to every other node it knows about.
+    Nodes announce themselves with `hello` on start and `bye` on shutdown.
+    Sends never block: if a peer's queue is full the event is dropped and
+    counted, so one stuck process cannot stall the others.
+    """
+
+    def __init__(self, directory, node_id, on_event):
+        self.directory = directory
+        self.node_id = str(node_id)
+        self.on_event = on_event
+        self.path = self._path(self.node_id)
+        self.peers = set()
+        self.peers_lock = threading.Lock()
+        self.dropped = 0
+        self.closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a crashed node with the same id
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.reader = threading.Thread(target=self._read_loop, daemon=True)
+
+    def _path(self, node_id):
+        return os.path.join(self.directory, f"node-{node_id}.sock")
+
+    def start(self):
+        """Start receiving and introduce ourselves to the nodes already running"""
+        self.reader.start()
+        for name in os.listdir(self.directory):
+            if name.startswith('node-') and name.endswith('.sock'):
+                node_id = name[len('node-'):-len('.sock')]
+                if node_id != self.node_id:
+                    with self.peers_lock:
+                        self.peers.add(node_id)
+        self.publish({'type': 'hello'})
+
+    def publish(self, event):
+        """Send an event to every known peer"""
+        event['origin'] = self.node_id
+        data = json.dumps(event).encode()
+        if len(data) > MAX_EVENT:
+            print(f"Not relaying a {len(data)} byte {event.get('type')} event (limit {MAX_EVENT})")
+            self.dropped += 1
+            return
+        with self.peers_lock:
+            peers = list(self.peers)
+        for node_id in peers:
+            try:
+                self.sock.sendto(data, socket.MSG_DONTWAIT, self._path(node_id))
+            except BlockingIOError:
+                self.dropped += 1
+            except (FileNotFoundError, ConnectionRefusedError):
+                # That node is gone without saying bye
+                self._forget(node_id)
+                self.on_event({'type': 'bye', 'origin': node_id})
+            except OSError as e:
+                print(f"Relay to node {node_id} failed: {e}")
+                self.dropped += 1
+
+    def _forget(self, node_id):
+        with self.peers_lock:
+            self.peers.discard(node_id)
+
+    def _read_loop(self):
+        while not self.closed:
+            try:
+                data, _, flags, _ = self.sock.recvmsg(MAX_EVENT)
+            except OSError:
+                break
+            if self.closed:
+                break
+            if flags & socket.MSG_TRUNC:
+                print(f"Dropped a relayed event over {MAX_EVENT} bytes")
+                self.dropped += 1
+                continue
+            try:
+                event = json.loads(data)
+            except ValueError:
+                print("Dropped a relayed event that is not valid JSON")
+                self.dropped += 1
+                continue
+            origin = event.get('origin')
+            if event.get('type') == 'hello':
+                with self.peers_lock:
+                    self.peers.add(origin)
+            elif event.get('type') == 'bye':
+                self._forget(origin)
+            self.on_event(event)
+
+    def close(self):
+        if self.closed:
+            return
+        self.publish({'type': 'bye'})
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
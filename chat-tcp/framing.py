@@ -0,0 +1,65 @@
+import struct
+
+# Frame = 4-byte big-endian length + payload. Lengths are capped below 16 MiB,
+# so a framed stream always starts with a zero byte, which plain text never does.
+HEADER = struct.Struct('!I')
+MAX_FRAME = (1 << 24) - 1
+# Stay well under IOV_MAX (1024) buffers per sendmsg() call
+MAX_BATCH_FRAMES = 256
+
+def is_framed(first_byte):
+    """True if the first byte of a connection starts a length-prefixed frame"""
+    return first_byte == b'\x00'
+
+def recv_exact(sock, n):
+    """Receive exactly n bytes, or None if the peer closed the connection first"""
+    buffer = bytearray(n)
+    view = memoryview(buffer)
+    received = 0
+    while received < n:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return bytes(buffer)
+
+def recv_frame(sock):
+    """Receive one frame's payload, or None on a clean close"""
+    header = recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit")
+    if length == 0:
+        return b''
+    return recv_exact(sock, length)
+
+def encode_frame(payload):
+    """Header + payload as one bytes object (for single, unbatched sends)"""
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds the {MAX_FRAME} byte limit")
+    return HEADER.pack(len(payload)) + payload
+
+def send_frames(sock, payloads):
+    """Send many frames with scatter-gather sendmsg() calls instead of one sendall each"""
+    buffers = []
+    for payload in payloads:
+        buffers.append(HEADER.pack(len(payload)))
+        buffers.append(payload)
+    send_buffers(sock, buffers)
+
+def send_buffers(sock, buffers):
+    """sendmsg() every buffer, resuming after partial writes"""
+    views = [memoryview(buffer) for buffer in buffers if len(buffer)]
+    start = 0
+    while start < len(views):
+        sent = sock.sendmsg(views[start:])
+        # Skip past fully written buffers and trim the partially written one
+        while sent:
+            if sent >= len(views[start]):
+                sent -= len(views[start])
+                start += 1
+            else:
+                views[start] = views[start][sent:]
+                sent = 0
@@ -0,0 +1,71 @@
+import argparse
+import math
+import os
+import random
+from hamming import CODE_FAMILY, HammingBlockCodec
+
+def flip_bits(data, ber, rng):
+    """Binary symmetric channel: flip every bit independently with probability ber"""
+    corrupted = bytearray(data)
+    if ber <= 0:
+        return corrupted
+    total_bits = len(data) * 8
+    log_keep = math.log1p(-ber)
+    # Jump straight to the next flipped bit: gaps between errors are geometric
+    position = int(math.log(1.0 - rng.random()) / log_keep)
+    while position < total_bits:
+        corrupted[position >> 3] ^= 0x80 >> (position & 7)
+        position += 1 + int(math.log(1.0 - rng.random()) / log_keep)
+    return corrupted
+
+def goodput(codec, ber, frame_size, frames, rng):
+    """
+    Fraction of the raw link rate that arrives as correct payload.
+
+    A frame that decodes wrong is lost (and would be resent), so goodput is
+    the code's effective rate times the fraction of frames that survive.
+    """
+    delivered = 0
+    encoded_size = frame_size
+    for _ in range(frames):
+        message = os.urandom(frame_size)
+        encoded = codec.encode_bytes(message) if codec else message
+        encoded_size = len(encoded)
+        received = bytes(flip_bits(encoded, ber, rng))
+        decoded = codec.decode_bytes(received)[0] if codec else received
+        delivered += decoded == message
+    return frame_size / encoded_size * delivered / frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Goodput of each Hamming code vs channel bit error rate")
+    parser.add_argument('--frame-size', type=int, default=1024, help="Payload bytes per frame")
+    parser.add_argument('--frames', type=int, default=200, help="Frames simulated per code and BER")
+    parser.add_argument('--ber', type=float, nargs='+', default=[1e-6, 1e-5, 1e-4, 1e-3, 1e-2])
+    parser.add_argument('--link-mbps', type=float, default=None,
+                        help="Also print goodput in Mb/s for a link of this raw rate")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    codecs = [('uncoded', None)] + [(codec.name, codec) for codec in map(HammingBlockCodec, CODE_FAMILY)]
+    print(f"{args.frame_size} byte frames, {args.frames} frames per point, "
+          f"goodput as % of the raw link rate" + (f" (Mb/s at {args.link_mbps:g} Mb/s)" if args.link_mbps else ""))
+    print(f"{'code':<11}{'rate':>7}" + ''.join(f"{ber:>14.0e}" for ber in args.ber))
+
+    best = {}
+    for name, codec in codecs:
+        rate = args.frame_size / (codec.encoded_length(args.frame_size) if codec else args.frame_size)
+        row = f"{name:<11}{rate:>7.3f}"
+        for ber in args.ber:
+            result = goodput(codec, ber, args.frame_size, args.frames, rng)
+            if result > best.get(ber, (0, '-'))[0]:
+                best[ber] = (result, name)
+            cell = f"{result * 100:.1f}%"
+            if args.link_mbps:
+                cell += f" {result * args.link_mbps:.1f}"
+            row += f"{cell:>14}"
+        print(row)
+    print(f"{'best':<18}" + ''.join(f"{best.get(ber, (0, '-'))[1]:>14}" for ber in args.ber))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import time
+from hamming import HammingCodec, np
+
+def throughput(function, data, min_seconds=0.5):
+    """Run function(data) repeatedly for at least min_seconds; returns MB/s of input"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        function(data)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs * len(data) / elapsed / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Hamming(7,4) codec micro-benchmark")
+    parser.add_argument('--size', type=int, default=64 * 1024, help="Message size in bytes")
+    args = parser.parse_args()
+
+    message = os.urandom(args.size)
+    encoded = HammingCodec.encode_bytes(message)
+    assert encoded == HammingCodec.encode_bytes_bitwise(message), "encoder output differs"
+    assert HammingCodec.decode_bytes(encoded) == HammingCodec.decode_bytes_bitwise(encoded), \
+        "decoder output differs"
+
+    engines = [
+        ('encode bitwise', HammingCodec.encode_bytes_bitwise, message),
+        ('encode table', HammingCodec.encode_bytes_table, message),
+        ('decode bitwise', HammingCodec.decode_bytes_bitwise, encoded),
+        ('decode table', HammingCodec.decode_bytes_table, encoded),
+    ]
+    if np is not None:
+        engines += [
+            ('encode numpy', HammingCodec.encode_bytes_numpy, message),
+            ('decode numpy', HammingCodec.decode_bytes_numpy, encoded),
+        ]
+    print(f"{args.size} byte message ({len(encoded)} bytes encoded), MB/s of input")
+    results = {}
+    for name, function, data in engines:
+        results[name] = throughput(function, data)
+        print(f"{name:<16}{results[name]:>10.2f}")
+    print(f"encode speedup  {results['encode table'] / results['encode bitwise']:>10.1f}x")
+    print(f"decode speedup  {results['decode table'] / results['decode bitwise']:>10.1f}x")
+    if np is not None:
+        print(f"numpy encode vs table {results['encode numpy'] / results['encode table']:>6.1f}x")
+        print(f"numpy decode vs table {results['decode numpy'] / results['decode table']:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
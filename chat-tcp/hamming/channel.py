@@ -0,0 +1,203 @@
+import argparse
+import time
+import numpy as np
+from hamming import CODE_FAMILY, HammingBlockCodec, HammingCodec, SECDEDCodec
+
+# Frames simulated per NumPy batch; bounds memory at batch x frame bits
+BATCH_FRAMES = 4096
+
+class BinarySymmetricChannel:
+    """Every bit flips independently with probability ber"""
+
+    def __init__(self, ber):
+        self.ber = ber
+        self.name = f"BSC(ber={ber:g})"
+
+    def masks(self, rng, frames, bits):
+        return (rng.random((frames, bits), dtype=np.float32) < self.ber).astype(np.uint8)
+
+class GilbertElliottChannel:
+    """
+    Two-state burst channel.
+
+    The channel moves from the good to the bad state with probability
+    p_good_bad per bit and back with p_bad_good; bits flip with ber_good or
+    ber_bad depending on the state. Each frame starts in the stationary
+    distribution, so frames are independent of each other.
+    """
+
+    def __init__(self, p_good_bad, p_bad_good, ber_good, ber_bad):
+        self.p_good_bad = p_good_bad
+        self.p_bad_good = p_bad_good
+        self.ber_good = ber_good
+        self.ber_bad = ber_bad
+        self.name = (f"Gilbert-Elliott(G->B={p_good_bad:g}, B->G={p_bad_good:g}, "
+                     f"ber good={ber_good:g}, bad={ber_bad:g})")
+
+    def masks(self, rng, frames, bits):
+        bad = rng.random(frames) < self.p_good_bad / (self.p_good_bad + self.p_bad_good)
+        states = np.empty((frames, bits), dtype=bool)
+        # Step the chain along the frame for all frames at once
+        transitions = rng.random((frames, bits), dtype=np.float32)
+        for position in range(bits):
+            states[:, position] = bad
+            bad = np.where(bad, transitions[:, position] >= self.p_bad_good,
+                           transitions[:, position] < self.p_good_bad)
+        ber = np.where(states, np.float32(self.ber_bad), np.float32(self.ber_good))
+        return (rng.random((frames, bits), dtype=np.float32) < ber).astype(np.uint8)
+
+class FixedCountChannel:
+    """Exactly `errors` bits flip in every frame, at uniformly random distinct positions"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.name = f"fixed({errors} errors/frame)"
+
+    def masks(self, rng, frames, bits):
+        mask = np.zeros((frames, bits), dtype=np.uint8)
+        count = min(self.errors, bits)
+        if count:
+            keys = rng.random((frames, bits), dtype=np.float32)
+            positions = np.argpartition(keys, count - 1, axis=1)[:, :count]
+            mask[np.arange(frames)[:, None], positions] = 1
+        return mask
+
+# Codec adapters. Every code here is linear and decodes syndromes only, so the
+# outcome depends on the error pattern alone: each frame is sent as the
+# all-zero codeword and every 1 bit left after decoding is a residual error.
+# decode() returns (residual payload bit errors, frame in error, frame flagged
+# uncorrectable), one entry per frame.
+
+class Uncoded:
+    name = 'uncoded'
+
+    def __init__(self, frame_size):
+        self.frame_size = frame_size
+        self.frame_bits = frame_size * 8
+        self.rate = 1.0
+
+    def decode(self, masks):
+        residual = masks.sum(axis=1)
+        return residual, residual > 0, np.zeros(len(masks), dtype=bool)
+
+class Hamming74:
+    name = '(7,4)'
+
+    def __init__(self, frame_size):
+        self.frame_size = frame_size
+        self.frame_bits = HammingCodec.encoded_length(frame_size) * 8
+        self.rate = frame_size * 8 / self.frame_bits
+
+    def decode(self, masks):
+        # Frames are whole 7-byte groups, so the batch decodes as one stream
+        decoded, _ = HammingCodec.decode_bytes(np.packbits(masks, axis=1).tobytes())
+        bits = np.unpackbits(np.frombuffer(decoded, dtype=np.uint8)).reshape(len(masks), -1)
+        residual = bits.sum(axis=1)
+        return residual, residual > 0, np.zeros(len(masks), dtype=bool)
+
+class SECDED:
+    def __init__(self, frame_size, depth):
+        self.name = f"SECDED(8,4)x{depth}" if depth > 1 else 'SECDED(8,4)'
+        self.frame_size = frame_size
+        self.depth = depth
+        self.frame_bits = frame_size * 16
+        self.rate = 0.5
+
+    def decode(self, masks):
+        frames = len(masks)
+        decoded, _, uncorrectable = SECDEDCodec.decode_bytes(np.packbits(masks, axis=1).tobytes(), self.depth)
+        bits = np.unpackbits(np.frombuffer(decoded, dtype=np.uint8)).reshape(frames, -1)
+        residual = bits.sum(axis=1)
+        flagged = np.zeros(frames, dtype=bool)
+        flagged[np.asarray(uncorrectable, dtype=np.intp) // (2 * self.frame_size)] = True
+        return residual, (residual > 0) | flagged, flagged
+
+class BlockCode:
+    def __init__(self, frame_size, n):
+        self.codec = HammingBlockCodec(n)
+        self.name = self.codec.name
+        self.frame_size = frame_size
+        # Codewords per frame as encode_bytes lays them out: payload, closing bit, padding
+        self.blocks = frame_size * 8 // self.codec.k + 1
+        self.frame_bits = self.blocks * n  # Trailing byte padding carries nothing
+        self.rate = frame_size * 8 / self.frame_bits
+
+    def decode(self, masks):
+        frames = len(masks)
+        code = masks.reshape(frames * self.blocks, self.codec.n).copy()
+        self.codec.correct_codewords_numpy(code)
+        data = code[:, :self.codec.k].reshape(frames, -1)
+        residual = data[:, :self.frame_size * 8].sum(axis=1)
+        # A flipped closing or padding bit also breaks the frame: its length is lost
+        return residual, data.any(axis=1), np.zeros(frames, dtype=bool)
+
+def codecs(frame_size, depths):
+    yield Uncoded(frame_size)
+    yield Hamming74(frame_size)
+    for n in CODE_FAMILY[1:]:
+        yield BlockCode(frame_size, n)
+    for depth in depths:
+        yield SECDED(frame_size, depth)
+
+def simulate(codec, channel, frames, seed, batch=BATCH_FRAMES):
+    """
+    Run `frames` frames of one codec through one channel model.
+
+    Returns:
+        dict with the channel BER, frame error rate after decoding (FER),
+        the share of frames flagged uncorrectable, and the residual payload BER
+    """
+    rng = np.random.default_rng(seed)
+    channel_errors = residual_errors = frame_errors = flagged_frames = 0
+    for start in range(0, frames, batch):
+        masks = channel.masks(rng, min(batch, frames - start), codec.frame_bits)
+        residual, failed, flagged = codec.decode(masks)
+        channel_errors += int(masks.sum())
+        residual_errors += int(residual.sum())
+        frame_errors += int(failed.sum())
+        flagged_frames += int(flagged.sum())
+    return {
+        'ber': channel_errors / (frames * codec.frame_bits),
+        'fer': frame_errors / frames,
+        'flagged': flagged_frames / frames,
+        'residual_ber': residual_errors / (frames * codec.frame_size * 8),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk BER/FER simulation of the Hamming codecs over channel models")
+    parser.add_argument('--model', choices=['bsc', 'gilbert', 'fixed'], default='bsc')
+    parser.add_argument('--ber', type=float, default=1e-3, help="BSC bit error rate")
+    parser.add_argument('--p-good-bad', type=float, default=1e-3, help="Gilbert-Elliott good->bad per bit")
+    parser.add_argument('--p-bad-good', type=float, default=0.1, help="Gilbert-Elliott bad->good per bit")
+    parser.add_argument('--ber-good', type=float, default=1e-5, help="Gilbert-Elliott BER in the good state")
+    parser.add_argument('--ber-bad', type=float, default=0.3, help="Gilbert-Elliott BER in the bad state")
+    parser.add_argument('--errors', type=int, default=2, help="Errors per frame for the fixed-count model")
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--frame-size', type=int, default=64, help="Payload bytes per frame")
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 8], help="SECDED interleaver depths")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if args.frame_size < 4 or args.frame_size % 4:
+        parser.error("--frame-size must be a multiple of 4 (whole Hamming(7,4) groups)")
+    for depth in args.depths:
+        if depth < 1 or 2 * args.frame_size % depth:
+            parser.error(f"SECDED depth {depth} must divide the {2 * args.frame_size} codewords of a frame")
+
+    if args.model == 'bsc':
+        channel = BinarySymmetricChannel(args.ber)
+    elif args.model == 'gilbert':
+        channel = GilbertElliottChannel(args.p_good_bad, args.p_bad_good, args.ber_good, args.ber_bad)
+    else:
+        channel = FixedCountChannel(args.errors)
+
+    print(f"{channel.name}, {args.frames} frames of {args.frame_size} bytes, seed {args.seed}")
+    print(f"{'code':<16}{'rate':>7}{'channel BER':>14}{'FER':>12}{'flagged':>10}{'residual BER':>14}{'seconds':>9}")
+    for codec in codecs(args.frame_size, args.depths):
+        start = time.perf_counter()
+        result = simulate(codec, channel, args.frames, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"{codec.name:<16}{codec.rate:>7.3f}{result['ber']:>14.3e}{result['fer']:>12.3e}"
+              f"{result['flagged']:>10.3e}{result['residual_ber']:>14.3e}{elapsed:>9.2f}")
+
+if __name__ == "__main__":
+    main()
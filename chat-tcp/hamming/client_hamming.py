@@ -1,7 +1,10 @@
 import socket
 import threading
 import sys
-from hamming import HammingCodec
+from hamming import HammingCodec, HammingStreamDecoder
+
+# Encoded frames are read and decoded in chunks of at most this size
+RECV_CHUNK = 64 * 1024
 
 def send_message(sock, message):
     """Send a message with Hamming encoding"""
@@ -17,29 +20,32 @@ def send_message(sock, message):
     sock.sendall(length_bytes + encoded_data)
 
 def receive(sock, username):
+    decoder = HammingStreamDecoder()
     try:
         while True:
             # Receive length first
-            length_bytes = sock.recv(4)
-            if len(length_bytes) != 4:
-                print("\n[CLIENT] Server disconnected")
-                sock.close()
-                sys.exit(0)
+            length_bytes = b''
+            while len(length_bytes) < 4:
+                chunk = sock.recv(4 - len(length_bytes))
+                if not chunk:
+                    print("\n[CLIENT] Server disconnected")
+                    sock.close()
+                    sys.exit(0)
+                length_bytes += chunk
             
-            message_length = int.from_bytes(length_bytes, byteorder='big')
+            remaining = int.from_bytes(length_bytes, byteorder='big')
             
-            # Receive the encoded message
-            encoded_data = b''
-            while len(encoded_data) < message_length:
-                chunk = sock.recv(message_length - len(encoded_data))
+            # Decode the encoded message as it arrives, chunk by chunk
+            decoded_bytes = bytearray()
+            while remaining:
+                chunk = sock.recv(min(remaining, RECV_CHUNK))
                 if not chunk:
                     print("\n[CLIENT] Server disconnected")
                     sock.close()
                     sys.exit(0)
-                encoded_data += chunk
-            
-            # Decode the Hamming-encoded message
-            decoded_bytes, errors = HammingCodec.decode_bytes(encoded_data)
+                remaining -= len(chunk)
+                decoded_bytes += decoder.update(chunk)
+            errors = decoder.finish()
             
             if errors:
                 print(f"\n[CLIENT] 🔧 Corrected transmission errors: {errors}")
@@ -1,5 +1,16 @@
 import random
 
+try:
+    import numpy as np
+except ImportError:  # The NumPy engine is optional; the table engine covers everything
+    np = None
+
+# Payloads at least this large go through the NumPy engine when it is available
+NUMPY_THRESHOLD = 16 * 1024
+
+# Codeword lengths n of the selectable Hamming(n, k) codes, k = n - log2(n + 1)
+CODE_FAMILY = (7, 15, 31, 63, 127)
+
 class HammingCodec:
     """
     Hamming(7,4) encoder/decoder that can correct single-bit errors.
@@ -83,6 +94,198 @@ class HammingCodec:
         """
         Encode bytes data using Hamming(7,4) code.
         
+        Large payloads use the NumPy engine when NumPy is installed,
+        everything else the table engine; both produce the same bytes.
+        
+        Args:
+            data: bytes-like object
+            
+        Returns:
+            bytes: Encoded data with Hamming codes
+        """
+        if np is not None and len(data) >= NUMPY_THRESHOLD:
+            return HammingCodec.encode_bytes_numpy(data)
+        return HammingCodec.encode_bytes_table(data)
+    
+    @staticmethod
+    def decode_bytes(encoded_data, bit_offset=0):
+        """
+        Decode Hamming-encoded bytes data.
+        
+        Args:
+            encoded_data: bytes-like object with Hamming-encoded data
+            bit_offset: Stream position of the first bit, added to the
+                reported error positions (used by HammingStreamDecoder)
+            
+        Returns:
+            Tuple: (decoded_bytes, errors_corrected)
+            - decoded_bytes: Original data with errors corrected
+            - errors_corrected: List of error positions that were corrected
+        """
+        if np is not None and len(encoded_data) >= NUMPY_THRESHOLD:
+            return HammingCodec.decode_bytes_numpy(encoded_data, bit_offset)
+        return HammingCodec.decode_bytes_table(encoded_data, bit_offset)
+    
+    @staticmethod
+    def encoded_length(data_length):
+        """Size in bytes of the encoding of data_length bytes (14 bits each, padded)"""
+        return (data_length * 14 + 7) // 8
+    
+    @staticmethod
+    def encode_bytes_table(data):
+        """
+        Encode bytes data using Hamming(7,4) code (table-driven).
+        
+        Every input byte becomes a 14-bit codeword pair looked up in
+        ENCODE_TABLE. Four bytes give 56 bits, i.e. exactly 7 output bytes,
+        so whole groups are written without any bit-level repacking.
+        
+        Args:
+            data: bytes-like object
+            
+        Returns:
+            bytes: Encoded data, bit-identical to encode_bytes_bitwise()
+        """
+        table = ENCODE_TABLE
+        result = bytearray()
+        full = len(data) - len(data) % 4
+        for i in range(0, full, 4):
+            value = (table[data[i]] << 42 | table[data[i + 1]] << 28
+                     | table[data[i + 2]] << 14 | table[data[i + 3]])
+            result += value.to_bytes(7, 'big')
+        
+        # 1-3 leftover bytes: pad the last 14/28/42 bits to a byte boundary
+        if full < len(data):
+            value = 0
+            for byte in data[full:]:
+                value = value << 14 | table[byte]
+            bits = 14 * (len(data) - full)
+            length = (bits + 7) // 8
+            result += (value << (length * 8 - bits)).to_bytes(length, 'big')
+        
+        return bytes(result)
+    
+    @staticmethod
+    def decode_bytes_table(encoded_data, bit_offset=0):
+        """
+        Decode Hamming-encoded bytes data (table-driven).
+        
+        Each 7-byte group holds four 14-bit codeword pairs; every 7-bit
+        codeword is corrected through the 128-entry DECODE_TABLE.
+        
+        Args:
+            encoded_data: bytes-like object with Hamming-encoded data
+            bit_offset: Added to the reported error positions
+            
+        Returns:
+            Tuple: (decoded_bytes, errors_corrected), identical to
+            decode_bytes_bitwise()
+        """
+        table = DECODE_TABLE
+        decoded = bytearray()
+        errors_corrected = []
+        full = len(encoded_data) - len(encoded_data) % 7
+        
+        for group in range(0, full, 7):
+            value = int.from_bytes(encoded_data[group:group + 7], 'big')
+            # Bit offset of this group's first codeword pair
+            offset = bit_offset + group * 8
+            for shift in (42, 28, 14, 0):
+                high, error_high = table[(value >> (shift + 7)) & 0x7F]
+                low, error_low = table[(value >> shift) & 0x7F]
+                decoded.append(high << 4 | low)
+                if error_high:
+                    errors_corrected.append(f"Bit {offset + error_high}")
+                if error_low:
+                    errors_corrected.append(f"Bit {offset + 7 + error_low}")
+                offset += 14
+        
+        # Trailing bytes hold fewer than four pairs (plus padding, which is skipped)
+        tail = len(encoded_data) - full
+        pairs = tail * 8 // 14
+        if pairs:
+            value = int.from_bytes(encoded_data[full:], 'big') >> (tail * 8 - pairs * 14)
+            offset = bit_offset + full * 8
+            for shift in range(14 * (pairs - 1), -1, -14):
+                high, error_high = table[(value >> (shift + 7)) & 0x7F]
+                low, error_low = table[(value >> shift) & 0x7F]
+                decoded.append(high << 4 | low)
+                if error_high:
+                    errors_corrected.append(f"Bit {offset + error_high}")
+                if error_low:
+                    errors_corrected.append(f"Bit {offset + 7 + error_low}")
+                offset += 14
+        
+        return bytes(decoded), errors_corrected
+    
+    @staticmethod
+    def encode_bytes_numpy(data):
+        """
+        Encode bytes data as one GF(2) matrix product (requires NumPy).
+        
+        All nibbles are unpacked into an (N, 4) bit matrix and multiplied by
+        the generator matrix G (4x7) mod 2 in a single operation.
+        
+        Args:
+            data: bytes-like object
+            
+        Returns:
+            bytes: Encoded data, bit-identical to encode_bytes_table()
+        """
+        if np is None:
+            raise RuntimeError("The NumPy Hamming engine requires numpy")
+        if not data:
+            return b''
+        
+        nibbles = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).reshape(-1, 4)
+        codewords = gf2_product(nibbles, GENERATOR_MATRIX)
+        # packbits pads the final byte with zeros, like the reference encoder
+        return np.packbits(codewords).tobytes()
+    
+    @staticmethod
+    def decode_bytes_numpy(encoded_data, bit_offset=0):
+        """
+        Decode Hamming-encoded bytes with one parity-check product (requires NumPy).
+        
+        The syndromes of all codewords come from a single (N, 7) x (7, 3)
+        product mod 2; single-bit errors are then flipped with fancy indexing.
+        
+        Args:
+            encoded_data: bytes-like object with Hamming-encoded data
+            bit_offset: Added to the reported error positions
+            
+        Returns:
+            Tuple: (decoded_bytes, errors_corrected), identical to decode_bytes_table()
+        """
+        if np is None:
+            raise RuntimeError("The NumPy Hamming engine requires numpy")
+        
+        bits = np.unpackbits(np.frombuffer(encoded_data, dtype=np.uint8))
+        pairs = len(bits) // 14  # Incomplete trailing groups (padding) are skipped
+        if not pairs:
+            return b'', []
+        codewords = bits[:pairs * 14].reshape(-1, 7)
+        
+        # Syndrome (s3,s2,s1) read as a number is the 1-indexed error position
+        syndromes = gf2_product(codewords, PARITY_CHECK_MATRIX)
+        positions = syndromes @ SYNDROME_WEIGHTS
+        erroneous = np.flatnonzero(positions)
+        codewords[erroneous, positions[erroneous] - 1] ^= 1
+        
+        decoded = np.packbits(codewords[:, DATA_COLUMNS].reshape(-1, 8)).tobytes()
+        # Codeword k starts at bit 7*k of the stream
+        errors_corrected = [f"Bit {bit_offset + bit}"
+                            for bit in (erroneous * 7 + positions[erroneous]).tolist()]
+        return decoded, errors_corrected
+    
+    @staticmethod
+    def encode_bytes_bitwise(data):
+        """
+        Encode bytes data using Hamming(7,4) code, one bit at a time.
+        
+        Reference implementation of encode_bytes_table(), kept for verification
+        and benchmarks.
+        
         Args:
             data: bytes object
             
@@ -121,9 +324,12 @@ class HammingCodec:
         return bytes(result)
     
     @staticmethod
-    def decode_bytes(encoded_data):
+    def decode_bytes_bitwise(encoded_data):
         """
-        Decode Hamming-encoded bytes data.
+        Decode Hamming-encoded bytes data, one bit at a time.
+        
+        Reference implementation of decode_bytes_table(), kept for verification
+        and benchmarks.
         
         Args:
             encoded_data: bytes object with Hamming-encoded data
@@ -174,6 +380,48 @@ class HammingCodec:
         
         return bytes(decoded_bytes), errors_corrected
     
+    @staticmethod
+    def random_bit_flip(length):
+        """
+        Pick a random single-bit error for a buffer of the given length.
+        
+        Args:
+            length: Number of bytes in the buffer
+            
+        Returns:
+            Tuple: (byte_pos, bit_pos) of the bit to flip
+        """
+        return random.randint(0, length - 1), random.randint(0, 7)
+    
+    @staticmethod
+    def overlay_bit_flips(data, flips):
+        """
+        Apply sparse bit flips as an overlay instead of copying the buffer.
+        
+        Args:
+            data: bytes object shared between recipients (left untouched)
+            flips: Iterable of (byte_pos, bit_pos) pairs
+            
+        Returns:
+            List of buffers (memoryview slices of data plus the flipped bytes)
+            that together form the corrupted data, ready for sendmsg()
+        """
+        flipped = {}
+        for byte_pos, bit_pos in flips:
+            flipped[byte_pos] = flipped.get(byte_pos, data[byte_pos]) ^ (1 << bit_pos)
+        
+        view = memoryview(data)
+        buffers = []
+        start = 0
+        for byte_pos in sorted(flipped):
+            if byte_pos > start:
+                buffers.append(view[start:byte_pos])
+            buffers.append(bytes([flipped[byte_pos]]))
+            start = byte_pos + 1
+        if start < len(data):
+            buffers.append(view[start:])
+        return buffers
+    
     @staticmethod
     def introduce_random_error(data):
         """
@@ -188,18 +436,525 @@ class HammingCodec:
         if not data:
             return data
         
-        data_array = bytearray(data)
+        byte_pos, bit_pos = HammingCodec.random_bit_flip(len(data))
         
-        # Choose random byte and bit position
-        byte_pos = random.randint(0, len(data_array) - 1)
-        bit_pos = random.randint(0, 7)
+        print(f"[SERVER] Introduced error at byte {byte_pos}, bit {bit_pos}")
         
-        # Flip the bit
-        data_array[byte_pos] ^= (1 << bit_pos)
+        return b''.join(HammingCodec.overlay_bit_flips(data, [(byte_pos, bit_pos)]))
+
+class HammingStreamEncoder:
+    """
+    Incremental Hamming(7,4) encoder.
+    
+    Feed a message in chunks of any size; every 4 input bytes become exactly
+    7 output bytes, so at most 3 bytes are held back between calls. The
+    concatenated output of update() and finish() equals encode_bytes() of
+    the whole message.
+    """
+    
+    def __init__(self):
+        self._pending = b''
+    
+    def update(self, chunk):
+        """Encode what can be encoded now; returns the encoded bytes"""
+        data = self._pending + bytes(chunk) if self._pending else chunk
+        aligned = len(data) - len(data) % 4
+        self._pending = bytes(data[aligned:])
+        return HammingCodec.encode_bytes(data[:aligned]) if aligned else b''
+    
+    def finish(self):
+        """Encode the last 1-3 bytes with their padding and reset the encoder"""
+        tail, self._pending = self._pending, b''
+        return HammingCodec.encode_bytes(tail)
+
+
+class HammingStreamDecoder:
+    """
+    Incremental Hamming(7,4) decoder.
+    
+    Feed encoded data in chunks of any size; each byte is emitted as soon as
+    its 14-bit codeword pair is complete. At most 13 bits are held back
+    between calls. Error positions are reported relative to the start of
+    the stream, as decode_bytes() would report them for the whole message.
+    """
+    
+    def __init__(self):
+        self.errors_corrected = []
+        self._bits = 0      # Leftover bits that do not yet form a full pair
+        self._bit_count = 0
+        self._offset = 0    # Stream position (in bits) of the next pair
+        self._consumed = 0  # Encoded bytes fed so far
+    
+    def update(self, chunk):
+        """Decode every complete codeword pair in chunk; returns the decoded bytes"""
+        chunk = memoryview(chunk)
+        decoded = bytearray()
         
-        print(f"[SERVER] Introduced error at byte {byte_pos}, bit {bit_pos}")
+        self._consumed += len(chunk)
+        
+        # Pairs line up with byte boundaries every 7 bytes (56 bits); bring the
+        # stream up to such a boundary bit by bit (at most 6 bytes)
+        head = min(-(self._consumed - len(chunk)) % 7, len(chunk))
+        if head:
+            decoded += self._decode_bits(chunk[:head])
+            chunk = chunk[head:]
+        
+        # Aligned middle goes through the fast engines in one call; only the
+        # last len % 7 bytes are left for the bitwise path
+        aligned = len(chunk) - len(chunk) % 7
+        if aligned:
+            data, errors = HammingCodec.decode_bytes(chunk[:aligned], self._offset)
+            decoded += data
+            self.errors_corrected.extend(errors)
+            self._offset += aligned * 8
+            chunk = chunk[aligned:]
+        
+        if len(chunk):
+            decoded += self._decode_bits(chunk)
+        return bytes(decoded)
+    
+    def _decode_bits(self, data):
+        """Slow path for partial groups: shift bytes in, decode full pairs"""
+        table = DECODE_TABLE
+        decoded = bytearray()
+        self._bits = self._bits << (8 * len(data)) | int.from_bytes(data, 'big')
+        self._bit_count += 8 * len(data)
+        while self._bit_count >= 14:
+            self._bit_count -= 14
+            pair = self._bits >> self._bit_count
+            self._bits &= (1 << self._bit_count) - 1
+            high, error_high = table[pair >> 7]
+            low, error_low = table[pair & 0x7F]
+            decoded.append(high << 4 | low)
+            if error_high:
+                self.errors_corrected.append(f"Bit {self._offset + error_high}")
+            if error_low:
+                self.errors_corrected.append(f"Bit {self._offset + 7 + error_low}")
+            self._offset += 14
+        return decoded
+    
+    def finish(self):
+        """
+        End of message: drop the padding bits and reset the decoder.
+        
+        Returns:
+            List of error positions corrected in the whole message
+        """
+        errors = self.errors_corrected
+        self.__init__()
+        return errors
+
+
+class SECDEDCodec:
+    """
+    Extended Hamming(8,4) SECDED codec with an optional block interleaver.
+    
+    Each nibble becomes one byte: the 7-bit Hamming(7,4) codeword followed by
+    an overall parity bit. A single-bit error is corrected; a double-bit error
+    in the same codeword is detected and reported instead of miscorrected.
+    
+    With depth > 1, every group of `depth` codewords is sent as a depth x 8 bit
+    matrix read column by column, so a burst of up to `depth` bits lands in
+    `depth` different codewords. The last group uses the codewords left over.
+    """
+    
+    @staticmethod
+    def encode_bytes(data, depth=1):
+        """
+        Encode bytes data, two codewords per byte (high nibble first).
+        
+        Args:
+            data: bytes-like object to encode
+            depth: Interleaver depth in codewords (1 disables interleaving)
+            
+        Returns:
+            bytes: Encoded data, twice the input length
+        """
+        data = bytes(data)
+        encoded = bytearray(2 * len(data))
+        encoded[0::2] = data.translate(SECDED_ENCODE_HIGH)
+        encoded[1::2] = data.translate(SECDED_ENCODE_LOW)
+        return _interleave(bytes(encoded), depth, inverse=False) if depth > 1 else bytes(encoded)
+    
+    @staticmethod
+    def decode_bytes(encoded_data, depth=1):
+        """
+        Decode SECDED-encoded bytes data.
+        
+        Args:
+            encoded_data: bytes-like object from encode_bytes
+            depth: Interleaver depth the data was encoded with
+            
+        Returns:
+            Tuple: (decoded_bytes, errors_corrected, uncorrectable)
+            - errors_corrected: list of "Bit N" positions (1-indexed, before interleaving)
+            - uncorrectable: indices of codewords with a detected double error;
+              their nibbles are left as received and the message should be resent
+        """
+        encoded = bytes(encoded_data)
+        if len(encoded) % 2:
+            raise ValueError(f"SECDED data must hold an even number of codewords, got {len(encoded)}")
+        if depth > 1:
+            encoded = _interleave(encoded, depth, inverse=True)
+        
+        high = encoded[0::2].translate(SECDED_DECODE_HIGH)
+        low = encoded[1::2].translate(SECDED_DECODE_LOW)
+        decoded = (int.from_bytes(high, 'big') | int.from_bytes(low, 'big')).to_bytes(len(high), 'big')
+        
+        errors_corrected = []
+        uncorrectable = []
+        status = encoded.translate(SECDED_STATUS)
+        if status.count(0) != len(status):
+            for index, code in enumerate(status):
+                if code == SECDED_DOUBLE:
+                    uncorrectable.append(index)
+                elif code:
+                    errors_corrected.append(f"Bit {index * 8 + code}")
+        return decoded, errors_corrected, uncorrectable
+
+
+class HammingBlockCodec:
+    """
+    Hamming(n, k) codec for any n in CODE_FAMILY, with the byte API of HammingCodec.
+    
+    (7,4) delegates to HammingCodec, so its output is unchanged. The longer
+    codes are systematic: each codeword is k data bits followed by r parity
+    bits, where data bit i has parity-check column cols[i] (the non-powers of
+    two in order) and parity bit t has column 2^t. The data bits are closed
+    with a single 1 bit and zero-padded to whole codewords, so the decoder
+    recovers the exact byte length however many bytes share the last block.
+    
+    Usage:
+        codec = HammingBlockCodec(63)   # (63,57)
+        encoded = codec.encode_bytes(data)
+        data, errors = codec.decode_bytes(encoded)
+    """
+    
+    def __init__(self, n=7):
+        if n not in CODE_FAMILY:
+            raise ValueError(f"Unsupported Hamming code length {n}; choose one of {CODE_FAMILY}")
+        self.n = n
+        self.r = n.bit_length()
+        self.k = n - self.r
+        columns = [c for c in range(1, n + 1) if c & (c - 1)]
+        # Syndrome column -> data bit index (0 = first transmitted data bit)
+        self.data_index = {column: i for i, column in enumerate(columns)}
+        # One 256-entry table per data byte (least significant first): XOR of the columns of its set bits
+        self.parity_tables = []
+        for low_bit in range(0, self.k, 8):
+            table = [0] * 256
+            for value in range(256):
+                for t in range(8):
+                    if value >> t & 1 and low_bit + t < self.k:
+                        table[value] ^= columns[self.k - 1 - low_bit - t]
+            self.parity_tables.append(table)
+        if np is not None:
+            self.check_matrix = self._check_matrix()
+            # Syndrome value -> bit index in the codeword
+            self.syndrome_position = np.zeros(1 << self.r, dtype=np.intp)
+            for index, column in enumerate(self._columns()):
+                self.syndrome_position[column] = index
+    
+    @property
+    def name(self):
+        return f"({self.n},{self.k})"
+    
+    @property
+    def rate(self):
+        return self.k / self.n
+    
+    def encoded_length(self, data_length):
+        """Size in bytes of the encoding of data_length bytes"""
+        if self.n == 7:
+            return HammingCodec.encoded_length(data_length)
+        blocks = data_length * 8 // self.k + 1  # Room for the closing 1 bit
+        return (blocks * self.n + 7) // 8
+    
+    def _parity(self, data):
+        """XOR of the parity-check columns of the set bits of a k-bit data word"""
+        parity = 0
+        for table in self.parity_tables:
+            parity ^= table[data & 0xFF]
+            data >>= 8
+        return parity
+    
+    def encode_bytes(self, data):
+        """
+        Encode bytes data with the Hamming(n, k) code.
+        
+        Large payloads use the NumPy engine when NumPy is installed,
+        everything else the table engine; both produce the same bytes.
+        
+        Args:
+            data: bytes-like object
+            
+        Returns:
+            bytes: Encoded data
+        """
+        if self.n == 7:
+            return HammingCodec.encode_bytes(data)
+        if np is not None and len(data) >= NUMPY_THRESHOLD:
+            return self.encode_bytes_numpy(data)
+        return self.encode_bytes_table(data)
+    
+    def decode_bytes(self, encoded_data):
+        """
+        Decode Hamming(n, k)-encoded bytes data.
         
-        return bytes(data_array)
+        Args:
+            encoded_data: bytes-like object from encode_bytes
+            
+        Returns:
+            Tuple: (decoded_bytes, errors_corrected)
+            - errors_corrected: list of "Bit N" positions (1-indexed in the stream)
+        """
+        if self.n == 7:
+            return HammingCodec.decode_bytes(encoded_data)
+        if np is not None and len(encoded_data) >= NUMPY_THRESHOLD:
+            return self.decode_bytes_numpy(encoded_data)
+        return self.decode_bytes_table(encoded_data)
+    
+    def encode_bytes_table(self, data):
+        """Encode one codeword at a time, parity from the per-byte column tables"""
+        n, k, r = self.n, self.k, self.r
+        bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b') if len(data) else ''
+        bits += '1'
+        bits += '0' * (-len(bits) % k)
+        words = [int(bits[i:i + k], 2) for i in range(0, len(bits), k)]
+        code_bits = ''.join([format(word << r | self._parity(word), f'0{n}b') for word in words])
+        code_bits += '0' * (-len(code_bits) % 8)
+        return int(code_bits, 2).to_bytes(len(code_bits) // 8, 'big')
+    
+    def decode_bytes_table(self, encoded_data):
+        """Decode one codeword at a time, syndrome from the per-byte column tables"""
+        n, k, r = self.n, self.k, self.r
+        parity_mask = (1 << r) - 1
+        data_index = self.data_index
+        bits = format(int.from_bytes(encoded_data, 'big'), f'0{len(encoded_data) * 8}b') if len(encoded_data) else ''
+        data_words = []
+        errors_corrected = []
+        for block in range(len(bits) // n):
+            codeword = int(bits[block * n:(block + 1) * n], 2)
+            word = codeword >> r
+            syndrome = (codeword & parity_mask) ^ self._parity(word)
+            if syndrome:
+                if syndrome & (syndrome - 1):
+                    index = data_index[syndrome]
+                    word ^= 1 << (k - 1 - index)
+                else:
+                    index = n - syndrome.bit_length()  # Parity bit t sits at n - 1 - t
+                errors_corrected.append(f"Bit {block * n + index + 1}")
+            data_words.append(format(word, f'0{k}b'))
+        
+        # Strip the zero padding and the closing 1 bit
+        data_bits = ''.join(data_words).rstrip('0')[:-1]
+        data_bits = data_bits[:len(data_bits) - len(data_bits) % 8]
+        if not data_bits:
+            return b'', errors_corrected
+        return int(data_bits, 2).to_bytes(len(data_bits) // 8, 'big'), errors_corrected
+    
+    def _columns(self):
+        """Parity-check column of every codeword bit, in transmission order"""
+        return list(self.data_index) + [1 << t for t in range(self.r - 1, -1, -1)]
+    
+    def _check_matrix(self):
+        """
+        (n, r) parity-check matrix in transmission order (requires NumPy).
+        
+        Row i holds the column of bit i, most significant syndrome bit first;
+        the first k rows double as the generator's parity part.
+        """
+        return np.array([[(column >> (self.r - 1 - j)) & 1 for j in range(self.r)] for column in self._columns()],
+                        dtype=np.uint8)
+    
+    def encode_bytes_numpy(self, data):
+        """Encode all codewords with one parity product (requires NumPy)"""
+        n, k = self.n, self.k
+        data_bits = np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8))
+        blocks = len(data_bits) // k + 1
+        words = np.zeros(blocks * k, dtype=np.uint8)
+        words[:len(data_bits)] = data_bits
+        words[len(data_bits)] = 1  # Closing bit
+        words = words.reshape(blocks, k)
+        
+        code = np.empty((blocks, n), dtype=np.uint8)
+        code[:, :k] = words
+        code[:, k:] = gf2_product(words, self.check_matrix[:k])
+        return np.packbits(code.ravel()).tobytes()
+    
+    def correct_codewords_numpy(self, code):
+        """
+        Correct single-bit errors in place in an (N, n) array of codeword bits (requires NumPy).
+        
+        Returns:
+            Tuple: (rows, positions) of the bits that were flipped back; the
+            data bits are then code[:, :k]
+        """
+        weights = 1 << np.arange(self.r - 1, -1, -1, dtype=np.intp)
+        syndromes = gf2_product(code, self.check_matrix).astype(np.intp) @ weights
+        erroneous = np.flatnonzero(syndromes)
+        positions = self.syndrome_position[syndromes[erroneous]]
+        code[erroneous, positions] ^= 1
+        return erroneous, positions
+    
+    def decode_bytes_numpy(self, encoded_data):
+        """Decode all codewords with one syndrome product and fancy-indexed flips (requires NumPy)"""
+        n, k = self.n, self.k
+        bits = np.unpackbits(np.frombuffer(bytes(encoded_data), dtype=np.uint8))
+        blocks = len(bits) // n
+        code = bits[:blocks * n].reshape(blocks, n).copy()
+        erroneous, positions = self.correct_codewords_numpy(code)
+        errors_corrected = [f"Bit {bit + 1}" for bit in (erroneous * n + positions).tolist()]
+        
+        # Strip the zero padding and the closing 1 bit
+        data_bits = code[:, :k].ravel()
+        set_bits = np.flatnonzero(data_bits)
+        length = int(set_bits[-1]) if len(set_bits) else 0
+        length -= length % 8
+        return np.packbits(data_bits[:length]).tobytes(), errors_corrected
+
+
+def _interleave(data, depth, inverse):
+    """
+    Block interleaver over codeword bytes.
+    
+    Each group of `depth` codewords is a depth x 8 bit matrix (one codeword
+    per row); it is sent transposed, column by column, and inverse=True
+    transposes it back. A shorter last group uses one row per codeword left,
+    so the output always has the same length as the input.
+    """
+    if not data:
+        return data
+    if np is not None and len(data) >= NUMPY_THRESHOLD:
+        full = len(data) - len(data) % depth
+        shape = (-1, 8, depth) if inverse else (-1, depth, 8)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=full)).reshape(shape)
+        head = np.packbits(bits.transpose(0, 2, 1)).tobytes()
+        return head + _interleave(data[full:], depth, inverse) if full < len(data) else head
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+    out = []
+    for start in range(0, len(bits), depth * 8):
+        group = bits[start:start + depth * 8]
+        # Reading every `step`-th bit transposes the matrix held in group
+        step = 8 if not inverse else len(group) // 8
+        out.extend(group[column::step] for column in range(step))
+    return int(''.join(out), 2).to_bytes(len(data), 'big')
+
+
+def _build_tables():
+    """
+    Precompute the lookup tables from the reference nibble/codeword routines.
+    
+    Returns:
+        Tuple: (encode_table, decode_table)
+        - encode_table: 256 entries, byte -> 14-bit codeword pair (high nibble first)
+        - decode_table: 128 entries, 7-bit codeword -> (corrected nibble, error_position)
+    """
+    encode_table = []
+    for byte in range(256):
+        high = HammingCodec.encode_nibble([(byte >> i) & 1 for i in range(7, 3, -1)])
+        low = HammingCodec.encode_nibble([(byte >> i) & 1 for i in range(3, -1, -1)])
+        value = 0
+        for bit in high + low:
+            value = value << 1 | bit
+        encode_table.append(value)
+    
+    decode_table = []
+    for codeword in range(128):
+        data_bits, error_pos = HammingCodec.decode_codeword([(codeword >> i) & 1 for i in range(6, -1, -1)])
+        nibble = data_bits[0] << 3 | data_bits[1] << 2 | data_bits[2] << 1 | data_bits[3]
+        decode_table.append((nibble, error_pos))
+    
+    return encode_table, decode_table
+
+
+ENCODE_TABLE, DECODE_TABLE = _build_tables()
+
+# SECDED status codes: 0 clean, 1-8 position of the corrected bit, SECDED_DOUBLE
+SECDED_DOUBLE = 0xFF
+
+
+def _build_secded_tables():
+    """
+    Precompute bytes.translate tables for SECDEDCodec.
+    
+    Returns:
+        Tuple: (encode_high, encode_low, decode_high, decode_low, status)
+        - encode_high/encode_low: byte -> codeword of its high/low nibble
+        - decode_high/decode_low: codeword -> corrected nibble, shifted into place
+          (for double errors the received data bits, uncorrected)
+        - status: codeword -> 0, the 1-indexed corrected position, or SECDED_DOUBLE
+    """
+    codewords = []
+    for nibble in range(16):
+        bits = HammingCodec.encode_nibble([(nibble >> i) & 1 for i in range(3, -1, -1)])
+        value = 0
+        for bit in bits:
+            value = value << 1 | bit
+        codewords.append(value << 1 | bin(value).count('1') & 1)
+    
+    decode_high, decode_low, status = bytearray(256), bytearray(256), bytearray(256)
+    for codeword in range(256):
+        nibble, error_pos = DECODE_TABLE[codeword >> 1]
+        parity_error = bin(codeword).count('1') & 1
+        if error_pos and not parity_error:
+            code = SECDED_DOUBLE  # Syndrome set but overall parity even: two flips
+            # Keep d1..d4 as received; "correcting" would flip a third bit
+            received = codeword >> 1
+            nibble = (received >> 4 & 1) << 3 | (received >> 2 & 1) << 2 | (received >> 1 & 1) << 1 | received & 1
+        elif parity_error:
+            code = error_pos or 8  # No syndrome: the overall parity bit itself flipped
+        else:
+            code = 0
+        decode_high[codeword] = nibble << 4
+        decode_low[codeword] = nibble
+        status[codeword] = code
+    
+    encode_high = bytes(codewords[byte >> 4] for byte in range(256))
+    encode_low = bytes(codewords[byte & 0x0F] for byte in range(256))
+    return encode_high, encode_low, bytes(decode_high), bytes(decode_low), bytes(status)
+
+
+(SECDED_ENCODE_HIGH, SECDED_ENCODE_LOW,
+ SECDED_DECODE_HIGH, SECDED_DECODE_LOW, SECDED_STATUS) = _build_secded_tables()
+
+if np is not None:
+    # Rows d1..d4 -> codeword [p1, p2, d1, p3, d2, d3, d4]
+    GENERATOR_MATRIX = np.array([
+        [1, 1, 1, 0, 0, 0, 0],
+        [1, 0, 0, 1, 1, 0, 0],
+        [0, 1, 0, 1, 0, 1, 0],
+        [1, 1, 0, 1, 0, 0, 1],
+    ], dtype=np.uint8)
+    # Row for position p holds the bits of p, giving syndrome columns (s1, s2, s3)
+    PARITY_CHECK_MATRIX = np.array([[(pos >> i) & 1 for i in range(3)] for pos in range(1, 8)],
+                                   dtype=np.uint8)
+    SYNDROME_WEIGHTS = np.array([1, 2, 4], dtype=np.intp)
+    DATA_COLUMNS = [2, 4, 5, 6]
+
+
+def gf2_product(bits, matrix):
+    """
+    Matrix product mod 2 of an (N, k) bit array and a (k, n) 0/1 matrix.
+    
+    Each output column is the XOR of the input columns selected by the
+    matrix column. For these tiny, sparse matrices that is several times
+    faster than an integer matmul, which NumPy runs without BLAS.
+    
+    Returns:
+        (N, n) uint8 array of bits
+    """
+    result = np.empty((bits.shape[0], matrix.shape[1]), dtype=np.uint8)
+    for column in range(matrix.shape[1]):
+        rows = np.flatnonzero(matrix[:, column])
+        if not len(rows):
+            result[:, column] = 0
+            continue
+        accumulator = bits[:, rows[0]].copy()
+        for row in rows[1:]:
+            accumulator ^= bits[:, row]
+        result[:, column] = accumulator
+    return result
 
 
 def test_hamming_codec():
@@ -239,6 +994,15 @@ def test_hamming_codec():
     print(f"Errors corrected: {errors}")
     print(f"Match original: {decoded_bytes == original_bytes}")
     print()
+    
+    # Test 3: SECDED double error is detected, not miscorrected
+    print("Test 3: SECDED 'Z' with p1 and p2 flipped")
+    encoded = bytearray(SECDEDCodec.encode_bytes(b'Z'))
+    encoded[0] ^= 0b11000000  # p1, p2 of the high-nibble codeword
+    decoded, errors, uncorrectable = SECDEDCodec.decode_bytes(encoded)
+    print(f"Decoded: {decoded}, uncorrectable codewords: {uncorrectable}")
+    assert decoded == b'Z' and uncorrectable == [0], "double error was miscorrected"
+    print()
 
 
 if __name__ == "__main__":
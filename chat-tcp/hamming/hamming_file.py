@@ -0,0 +1,128 @@
+import argparse
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from hamming import HammingCodec, SECDEDCodec
+
+# Input bytes per task; rounded down to a whole number of codec units
+SEGMENT_SIZE = 4 * 1024 * 1024
+
+def units(code, depth):
+    """
+    Smallest (data bytes, encoded bytes) pair that encodes independently.
+
+    Segments made of whole units can be encoded or decoded on their own and
+    written at offsets computed up front.
+    """
+    if code == 'hamming74':
+        return 4, 7  # 4 bytes -> eight 14-bit codeword pairs = 7 bytes
+    return depth, 2 * depth  # One interleaver group of SECDED codewords
+
+def output_size(mode, code, input_size):
+    if mode == 'encode':
+        if code == 'hamming74':
+            return HammingCodec.encoded_length(input_size)
+        return 2 * input_size
+    if code == 'hamming74':
+        return input_size * 8 // 14  # Padding is always shorter than a codeword pair
+    if input_size % 2:
+        raise ValueError(f"SECDED input must hold an even number of bytes, got {input_size}")
+    return input_size // 2
+
+def plan(mode, code, depth, input_size, segment_size):
+    """Split the input into aligned segments: list of (in_start, in_end, out_start, out_end)"""
+    data_unit, encoded_unit = units(code, depth)
+    in_unit, out_unit = (data_unit, encoded_unit) if mode == 'encode' else (encoded_unit, data_unit)
+    step = max(1, segment_size // in_unit) * in_unit
+    total_out = output_size(mode, code, input_size)
+    segments = []
+    for in_start in range(0, input_size, step):
+        in_end = min(in_start + step, input_size)
+        out_start = in_start // in_unit * out_unit
+        out_end = total_out if in_end == input_size else in_end // in_unit * out_unit
+        segments.append((in_start, in_end, out_start, out_end))
+    return segments
+
+def process_segment(mode, code, depth, input_path, output_path, segment):
+    """
+    Worker: encode or decode one segment straight between the two mapped files.
+
+    Returns:
+        Tuple: (errors_corrected, uncorrectable) counts for the segment
+    """
+    in_start, in_end, out_start, out_end = segment
+    with open(input_path, 'rb') as source, open(output_path, 'r+b') as target:
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+                mmap.mmap(target.fileno(), 0) as out:
+            chunk = data[in_start:in_end]
+            uncorrectable = []
+            if code == 'hamming74':
+                if mode == 'encode':
+                    result = HammingCodec.encode_bytes(chunk)
+                    errors = []
+                else:
+                    result, errors = HammingCodec.decode_bytes(chunk, in_start * 8)
+            elif mode == 'encode':
+                result = SECDEDCodec.encode_bytes(chunk, depth)
+                errors = []
+            else:
+                result, errors, uncorrectable = SECDEDCodec.decode_bytes(chunk, depth)
+            out[out_start:out_end] = result[:out_end - out_start]
+    return len(errors), len(uncorrectable)
+
+def run(mode, code, depth, input_path, output_path, workers=None, segment_size=SEGMENT_SIZE):
+    """Encode or decode a whole file; returns (bytes_in, bytes_out, errors_corrected, uncorrectable)"""
+    input_size = os.path.getsize(input_path)
+    size = output_size(mode, code, input_size)
+    # Preallocate the output so every worker can map it and write its own range
+    with open(output_path, 'wb') as target:
+        target.truncate(size)
+    # Nothing to map: an empty input, or one shorter than a single codeword
+    if not input_size or not size:
+        return input_size, 0, 0, 0
+
+    segments = plan(mode, code, depth, input_size, segment_size)
+    corrected = uncorrectable = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_segment, mode, code, depth, input_path, output_path, segment)
+                   for segment in segments]
+        for future in futures:
+            segment_corrected, segment_uncorrectable = future.result()
+            corrected += segment_corrected
+            uncorrectable += segment_uncorrectable
+    return input_size, size, corrected, uncorrectable
+
+def main():
+    parser = argparse.ArgumentParser(description="Hamming-encode or decode a file across all cores")
+    parser.add_argument('mode', choices=['encode', 'decode'])
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--code', choices=['hamming74', 'secded'], default='hamming74',
+                        help="Hamming(7,4) or extended Hamming(8,4) SECDED")
+    parser.add_argument('--depth', type=int, default=1, help="SECDED interleaver depth in codewords")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--segment-size', type=int, default=SEGMENT_SIZE, help="Input bytes per task")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+    if args.code == 'hamming74' and args.depth != 1:
+        parser.error("--depth only applies to --code secded")
+
+    start = time.perf_counter()
+    try:
+        size_in, size_out, corrected, uncorrectable = run(
+            args.mode, args.code, args.depth, args.input, args.output, args.workers, args.segment_size)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.mode}d {size_in} -> {size_out} bytes in {elapsed:.2f}s "
+          f"({size_in / elapsed / 1e6 if elapsed else 0:.1f} MB/s)")
+    if args.mode == 'decode':
+        print(f"errors corrected: {corrected}")
+        if args.code == 'secded':
+            print(f"uncorrectable codewords: {uncorrectable}")
+
+if __name__ == "__main__":
+    main()
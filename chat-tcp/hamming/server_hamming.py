@@ -1,12 +1,95 @@
+import fcntl
+import os
 import socket
+import struct
+import termios
 import threading
 import sys
-from hamming import HammingCodec
+import time
+from hamming import HammingCodec, HammingStreamDecoder
+
+# Shared framing helpers live in the chat-tcp directory above this one
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framing import send_buffers
 
 # Dictionary to store client connections and usernames
 clients = {}
 clients_lock = threading.Lock()
 
+# Connection -> lock held while writing one frame, so concurrent broadcasts
+# never interleave their partial writes on the same socket
+send_locks = {}
+
+# Backpressure on the kernel send queue of each client: above the high
+# watermark a client is congested and misses broadcasts until it drains below
+# the low watermark; congested for too long, or a send stalled for
+# SEND_TIMEOUT, gets it evicted.
+HIGH_WATERMARK = 256 * 1024
+LOW_WATERMARK = 64 * 1024
+SLOW_EVICT_SECONDS = 10.0
+SEND_TIMEOUT = 5.0
+
+# Encoded frames are read and decoded in chunks of at most this size
+RECV_CHUNK = 64 * 1024
+
+# Connection -> time it became congested
+congested = {}
+
+# Server-wide backpressure counters, printed on shutdown
+stats = {'congested': 0, 'recovered': 0, 'dropped': 0, 'evicted_slow': 0, 'evicted_dead': 0}
+stats_lock = threading.Lock()
+
+def count(event):
+    with stats_lock:
+        stats[event] += 1
+
+# Linux-only ioctl for the unsent byte count; None elsewhere (e.g. macOS)
+TIOCOUTQ = getattr(termios, 'TIOCOUTQ', None)
+
+def unsent_bytes(conn):
+    """Bytes still waiting in the kernel send queue (0 if the platform can't tell)"""
+    if TIOCOUTQ is None:
+        return 0
+    try:
+        return struct.unpack('i', fcntl.ioctl(conn.fileno(), TIOCOUTQ, b'\0' * 4))[0]
+    except (OSError, ValueError):  # ValueError: closed by another thread (fileno() is -1)
+        return 0
+
+def is_congested(conn, username):
+    """Apply the watermarks to conn; True if this broadcast should skip it"""
+    queued = unsent_bytes(conn)
+    with clients_lock:
+        since = congested.get(conn)
+        if since is None:
+            if queued < HIGH_WATERMARK:
+                return False
+            congested[conn] = since = time.monotonic()
+            count('congested')
+        elif queued <= LOW_WATERMARK:
+            del congested[conn]
+            count('recovered')
+            return False
+    if time.monotonic() - since > SLOW_EVICT_SECONDS:
+        evict(conn, username, 'evicted_slow', "too slow for too long")
+    else:
+        count('dropped')
+    return True
+
+def evict(conn, username, reason, description):
+    """Remove a client right away; its handler thread sees the shutdown and exits"""
+    with clients_lock:
+        present = clients.pop(conn, None) is not None
+        congested.pop(conn, None)
+        send_locks.pop(conn, None)
+    if not present:
+        return  # Already evicted by another broadcast
+    count(reason)
+    print(f"[SERVER] {username} is {description}, disconnecting")
+    try:
+        conn.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
 def broadcast(message, sender_conn=None):
     """Send message to all clients except the sender with Hamming encoding and error injection"""
     if not message:
@@ -14,55 +97,81 @@ def broadcast(message, sender_conn=None):
     
     message_bytes = message.encode('utf-8')
     
+    # Encode once; every recipient shares the encoded buffer and header
+    encoded_data = HammingCodec.encode_bytes(message_bytes)
+    length_bytes = len(encoded_data).to_bytes(4, byteorder='big')
+    print(f"[SERVER] Original message size: {len(message_bytes)} bytes")
+    print(f"[SERVER] Encoded message size: {len(encoded_data)} bytes")
+    
     with clients_lock:
-        for conn, username in clients.items():
-            if conn != sender_conn:
-                try:
-                    # Encode message with Hamming code
-                    encoded_data = HammingCodec.encode_bytes(message_bytes)
-                    print(f"[SERVER] Original message size: {len(message_bytes)} bytes")
-                    print(f"[SERVER] Encoded message size: {len(encoded_data)} bytes")
-                    
-                    # Introduce a random single-bit error
-                    corrupted_data = HammingCodec.introduce_random_error(encoded_data)
-                    
-                    # Send length first, then the corrupted encoded data
-                    length_bytes = len(corrupted_data).to_bytes(4, byteorder='big')
-                    conn.sendall(length_bytes + corrupted_data)
-                    
-                except Exception as e:
-                    print(f"[SERVER] Error sending to {username}: {e}")
-                    # Remove failed connection later
-                    pass
+        recipients = [(conn, username, send_locks[conn]) for conn, username in clients.items() if conn != sender_conn]
+    
+    for conn, username, send_lock in recipients:
+        if is_congested(conn, username):
+            continue
+        try:
+            # Introduce a random single-bit error as an overlay on the shared buffer
+            byte_pos, bit_pos = HammingCodec.random_bit_flip(len(encoded_data))
+            print(f"[SERVER] Introduced error at byte {byte_pos}, bit {bit_pos} for {username}")
+            body = HammingCodec.overlay_bit_flips(encoded_data, [(byte_pos, bit_pos)])
+            
+            # Send length first, then the corrupted encoded data
+            with send_lock:
+                send_buffers(conn, [length_bytes] + body)
+            
+        except (socket.timeout, BlockingIOError):
+            # SO_SNDTIMEO expired with the kernel send buffer still full
+            evict(conn, username, 'evicted_slow', f"stalled for {SEND_TIMEOUT:.0f}s")
+        except Exception as e:
+            print(f"[SERVER] Error sending to {username}: {e}")
+            evict(conn, username, 'evicted_dead', "unreachable")
+
+def receive_message(conn, decoder):
+    """
+    Receive one length-prefixed Hamming frame, decoding it as it arrives.
+    
+    Returns:
+        Tuple of (decoded_bytes, errors_corrected), () for an empty frame,
+        or None if the connection closed mid-frame
+    """
+    length_bytes = b''
+    while len(length_bytes) < 4:
+        chunk = conn.recv(4 - len(length_bytes))
+        if not chunk:
+            return None
+        length_bytes += chunk
+    
+    remaining = int.from_bytes(length_bytes, byteorder='big')
+    if remaining == 0:
+        return ()
+    
+    decoded = bytearray()
+    while remaining:
+        chunk = conn.recv(min(remaining, RECV_CHUNK))
+        if not chunk:
+            decoder.finish()
+            return None
+        remaining -= len(chunk)
+        decoded += decoder.update(chunk)
+    return bytes(decoded), decoder.finish()
 
 def handle_client(conn, addr):
     """Handle individual client connection"""
     username = None
+    # Bound how long a broadcast can block on this client's full send buffer
+    seconds = int(SEND_TIMEOUT)
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
+                    struct.pack('ll', seconds, int((SEND_TIMEOUT - seconds) * 1e6)))
     
     try:
         # First message should be the username
-        # Receive length first
-        length_bytes = conn.recv(4)
-        if len(length_bytes) != 4:
-            print(f"[SERVER] Failed to receive length from {addr}")
-            return
-        
-        message_length = int.from_bytes(length_bytes, byteorder='big')
-        
-        # Receive the encoded message
-        encoded_data = b''
-        while len(encoded_data) < message_length:
-            chunk = conn.recv(message_length - len(encoded_data))
-            if not chunk:
-                break
-            encoded_data += chunk
-        
-        if len(encoded_data) != message_length:
-            print(f"[SERVER] Incomplete message from {addr}")
+        decoder = HammingStreamDecoder()
+        message = receive_message(conn, decoder)
+        if message is None:
+            print(f"[SERVER] Incomplete username message from {addr}")
             return
         
-        # Decode the Hamming-encoded username message
-        decoded_bytes, errors = HammingCodec.decode_bytes(encoded_data)
+        decoded_bytes, errors = message
         if errors:
             print(f"[SERVER] Corrected errors in username message: {errors}")
         
@@ -72,40 +181,25 @@ def handle_client(conn, addr):
             username = initial_msg[9:]
             with clients_lock:
                 clients[conn] = username
+                send_locks[conn] = threading.Lock()
             print(f"[SERVER] {username} connected from {addr}")
             broadcast(f"{username} has joined the chat", conn)
         else:
             username = f"Guest_{addr[0]}_{addr[1]}"
             with clients_lock:
                 clients[conn] = username
+                send_locks[conn] = threading.Lock()
             print(f"[SERVER] {username} connected from {addr}")
             broadcast(f"{username} has joined the chat", conn)
         
         # Main message handling loop
         while True:
             try:
-                # Receive length first
-                length_bytes = conn.recv(4)
-                if len(length_bytes) != 4:
-                    break
-                
-                message_length = int.from_bytes(length_bytes, byteorder='big')
-                if message_length == 0:
-                    break
-                
-                # Receive the encoded message
-                encoded_data = b''
-                while len(encoded_data) < message_length:
-                    chunk = conn.recv(message_length - len(encoded_data))
-                    if not chunk:
-                        break
-                    encoded_data += chunk
-                
-                if len(encoded_data) != message_length:
+                message = receive_message(conn, decoder)
+                if not message:
                     break
                 
-                # Decode the Hamming-encoded message
-                decoded_bytes, errors = HammingCodec.decode_bytes(encoded_data)
+                decoded_bytes, errors = message
                 if errors:
                     print(f"[SERVER] Corrected errors from {username}: {errors}")
                 
@@ -130,6 +224,8 @@ def handle_client(conn, addr):
             with clients_lock:
                 if conn in clients:
                     del clients[conn]
+                congested.pop(conn, None)
+                send_locks.pop(conn, None)
             broadcast(f"{username} has left the chat")
         conn.close()
 
@@ -173,6 +269,8 @@ def main():
                     pass
         server_socket.close()
         print("[SERVER] Server shut down")
+        with stats_lock:
+            print("[SERVER] Backpressure: " + ', '.join(f"{name}={value}" for name, value in stats.items()))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
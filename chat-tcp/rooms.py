@@ -0,0 +1,107 @@
+import threading
+
+DEFAULT_ROOM = 'lobby'
+SHARD_COUNT = 16
+# 2^64 / golden ratio, for spreading object ids over the connected-client shards
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+
+class Shard:
+    """One slice of the registry: its own lock and the entries that hash to it"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.table = {}
+
+class RoomRegistry:
+    """
+    Sharded room membership.
+
+    Rooms are spread over independent shards by hash, so joins, leaves and
+    fan-out in rooms on different shards never wait on the same lock.
+    Each client tracks the rooms it joined in `client.rooms`.
+    """
+
+    def __init__(self, shard_count=SHARD_COUNT):
+        self.shards = [Shard() for _ in range(shard_count)]
+        # Connected clients, sharded the same way so connects don't share one lock
+        self.connected = [Shard() for _ in range(shard_count)]
+
+    def _shard(self, room):
+        return self.shards[hash(room) % len(self.shards)]
+
+    def _connected_shard(self, client):
+        # id() steps by the (aligned) object size, so its low bits barely vary;
+        # Fibonacci hashing mixes every bit into the ones we keep
+        mixed = (id(client) * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF
+        return self.connected[(mixed >> 32) % len(self.connected)]
+
+    def add(self, client):
+        """Register a newly connected client (not yet in any room)"""
+        shard = self._connected_shard(client)
+        with shard.lock:
+            shard.table[client] = None
+
+    def remove(self, client):
+        """Forget a client and take it out of every room; returns the rooms it was in"""
+        shard = self._connected_shard(client)
+        with shard.lock:
+            shard.table.pop(client, None)
+        rooms = list(client.rooms)
+        for room in rooms:
+            self.leave(client, room)
+        return rooms
+
+    def join(self, client, room):
+        shard = self._shard(room)
+        with shard.lock:
+            shard.table.setdefault(room, set()).add(client)
+        client.rooms.add(room)
+
+    def leave(self, client, room):
+        shard = self._shard(room)
+        with shard.lock:
+            members = shard.table.get(room)
+            if members is not None:
+                members.discard(client)
+                if not members:
+                    del shard.table[room]
+        client.rooms.discard(room)
+
+    def members(self, room):
+        """Snapshot of a room's members, taken under that room's shard lock only"""
+        shard = self._shard(room)
+        with shard.lock:
+            return list(shard.table.get(room, ()))
+
+    def broadcast(self, room, data, exclude=None, wait=True):
+        """Enqueue data for every member of room except `exclude`; returns the fan-out"""
+        sent = 0
+        for client in self.members(room):
+            if client is not exclude:
+                client.enqueue(data, wait)
+                sent += 1
+        return sent
+
+    def clients(self):
+        """Snapshot of every connected client"""
+        result = []
+        for shard in self.connected:
+            with shard.lock:
+                result.extend(shard.table)
+        return result
+
+    def connected_sizes(self):
+        """Connected client count per shard"""
+        sizes = []
+        for shard in self.connected:
+            with shard.lock:
+                sizes.append(len(shard.table))
+        return sizes
+
+    def room_sizes(self):
+        """Room name -> member count across all shards"""
+        sizes = {}
+        for shard in self.shards:
+            with shard.lock:
+                sizes.update((room, len(members)) for room, members in shard.table.items())
+        return sizes
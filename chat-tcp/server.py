@@ -1,107 +1,400 @@
+import argparse
+import multiprocessing
+import os
+import queue
 import socket
 import threading
 import sys
+import time
+from framing import MAX_BATCH_FRAMES, is_framed, recv_frame, send_frames
+from rooms import DEFAULT_ROOM, SHARD_COUNT, RoomRegistry
+from federation import RelayBus
 
-# Dictionary to store client connections and usernames
-clients = {}
-clients_lock = threading.Lock()
-
-def broadcast(message, sender_conn=None):
-    """Send message to all clients except the sender"""
-    with clients_lock:
-        for conn, username in clients.items():
-            if conn != sender_conn:
-                try:
-                    conn.sendall(message.encode())
-                except:
-                    # Remove failed connection later
-                    pass
-
-def handle_client(conn, addr):
-    """Handle individual client connection"""
+# Outbound buffering settings (overridable from the command line). Queued
+# bytes above the high watermark mark a client congested until its writer
+# drains them below the low watermark; staying congested too long evicts it.
+HIGH_WATERMARK = 256 * 1024
+LOW_WATERMARK = 64 * 1024
+SLOW_EVICT_SECONDS = 10.0
+FULL_QUEUE_POLICIES = ('drop', 'disconnect', 'block')
+FULL_QUEUE_POLICY = 'drop'
+
+# Server-wide backpressure counters, printed on shutdown and by /stats
+stats = {
+    'congested': 0,        # crossed the high watermark
+    'recovered': 0,        # drained back below the low watermark
+    'dropped': 0,          # messages dropped for congested clients
+    'disconnected': 0,     # congested clients cut off by the 'disconnect' policy
+    'evicted_slow': 0,     # congested for longer than SLOW_EVICT_SECONDS
+    'evicted_dead': 0,     # send failed, peer is gone
+}
+stats_lock = threading.Lock()
+
+def count(event):
+    with stats_lock:
+        stats[event] += 1
+
+class ClientConnection:
+    """A connected user with its own byte-accounted send queue drained by a writer thread"""
+
+    def __init__(self, conn, addr, username, policy=FULL_QUEUE_POLICY, framed=False,
+                 high_watermark=HIGH_WATERMARK, low_watermark=LOW_WATERMARK,
+                 evict_after=SLOW_EVICT_SECONDS):
+        self.conn = conn
+        self.addr = addr
+        self.username = username
+        self.framed = framed
+        # Rooms joined (maintained by RoomRegistry) and the room plain messages go to
+        self.rooms = set()
+        self.room = None
+        self.policy = policy
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.evict_after = evict_after
+        self.queue = queue.SimpleQueue()
+        # Bytes accepted by enqueue() but not yet written to the socket
+        self.queued_bytes = 0
+        self.congested_since = None
+        self.drained = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def enqueue(self, data, wait=True):
+        """
+        Queue bytes for this client; only the 'block' policy ever waits, and
+        with wait=False it drops instead (for threads that must not stall)
+        """
+        if self.closed:
+            return
+        with self.drained:
+            if self.congested_since is None and self.queued_bytes >= self.high_watermark:
+                self.congested_since = time.monotonic()
+                count('congested')
+            if self.congested_since is not None:
+                if time.monotonic() - self.congested_since > self.evict_after:
+                    self._evict('evicted_slow', "too slow for too long")
+                    return
+                if self.policy == 'drop' or (self.policy == 'block' and not wait):
+                    self.dropped += 1
+                    count('dropped')
+                    return
+                if self.policy == 'disconnect':
+                    self._evict('disconnected', "not keeping up")
+                    return
+                # 'block': only the sending thread waits, and never while holding a registry lock
+                deadline = self.congested_since + self.evict_after
+                while self.congested_since is not None and not self.closed:
+                    if not self.drained.wait(deadline - time.monotonic()):
+                        self._evict('evicted_slow', "too slow for too long")
+                        return
+                if self.closed:
+                    return
+            self.queued_bytes += len(data)
+        self.queue.put(data)
+
+    def _evict(self, reason, description):
+        count(reason)
+        print(f"{self.username} is {description}, disconnecting")
+        self.close()
+
+    def _sent(self, size):
+        """Account for bytes the writer has handed to the kernel"""
+        with self.drained:
+            self.queued_bytes -= size
+            if self.congested_since is not None and self.queued_bytes <= self.low_watermark:
+                self.congested_since = None
+                count('recovered')
+                self.drained.notify_all()
+
+    def _write_loop(self):
+        while True:
+            data = self.queue.get()
+            if data is None or self.closed:
+                break
+            try:
+                if self.framed:
+                    batch, stop = self._drain(data)
+                    send_frames(self.conn, batch)
+                    self._sent(sum(len(item) for item in batch))
+                    if stop:
+                        break
+                else:
+                    self.conn.sendall(data)
+                    self._sent(len(data))
+            except OSError:
+                if not self.closed:
+                    count('evicted_dead')
+                self.close()
+                break
+
+    def _drain(self, first):
+        """Collect everything already queued so it goes out in one sendmsg() call"""
+        batch = [first]
+        while len(batch) < MAX_BATCH_FRAMES:
+            try:
+                data = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if data is None:
+                # Flush what we have, then let the loop stop
+                return batch, True
+            batch.append(data)
+        return batch, False
+
+    def close(self):
+        """Stop the writer and wake up the reader blocked in recv()"""
+        with self.drained:
+            if self.closed:
+                return
+            # Set under the condition so a blocked enqueue() either sees it
+            # before waiting or is woken by the notify below
+            self.closed = True
+            self.drained.notify_all()
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.queue.put(None)
+
+# Connected clients and their rooms, split across independently locked shards
+registry = RoomRegistry()
+
+# Federation: relay bus to the other server processes and the users they host
+bus = None
+remote_users = {}
+remote_users_lock = threading.Lock()
+
+def broadcast(message, room, sender=None):
+    """Queue message for every member of room except the sender, here and on peer nodes"""
+    registry.broadcast(room, message.encode(), exclude=sender)
+    if bus is not None:
+        bus.publish({'type': 'msg', 'room': room, 'text': message})
+
+def announce(event_type, username):
+    """Tell peer nodes that a local user came online or went offline"""
+    if bus is not None:
+        bus.publish({'type': event_type, 'user': username})
+
+def handle_relay_event(event):
+    """Deliver an event relayed from another node (runs on the bus reader thread)"""
+    origin = event.get('origin')
+    kind = event.get('type')
+    if kind == 'msg':
+        # Never wait on a congested client here: every peer's events queue behind this thread
+        registry.broadcast(event['room'], event['text'].encode(), wait=False)
+    elif kind == 'hello':
+        # A new node needs our roster
+        bus.publish({'type': 'roster', 'users': [client.username for client in registry.clients()]})
+    elif kind == 'roster':
+        with remote_users_lock:
+            remote_users[origin] = set(event['users'])
+    elif kind == 'online':
+        with remote_users_lock:
+            remote_users.setdefault(origin, set()).add(event['user'])
+    elif kind == 'offline':
+        with remote_users_lock:
+            remote_users.get(origin, set()).discard(event['user'])
+    elif kind == 'bye':
+        with remote_users_lock:
+            remote_users.pop(origin, None)
+
+def format_stats():
+    with stats_lock:
+        counters = ', '.join(f"{name}={value}" for name, value in stats.items())
+    if bus is not None:
+        counters += f", relay_dropped={bus.dropped}"
+    return f"Backpressure: {counters}"
+
+def online_users():
+    """Usernames connected to this node and to every peer node"""
+    users = [client.username for client in registry.clients()]
+    with remote_users_lock:
+        for names in remote_users.values():
+            users.extend(names)
+    return sorted(users)
+
+def handle_command(client, text):
+    """Commands: /join <room>, /leave <room>, /rooms, /who, /stats"""
+    command, _, room = text.partition(' ')
+    room = room.strip()
+    if command == '/join' and room:
+        if room not in client.rooms:
+            registry.join(client, room)
+            broadcast(f"{client.username} has joined #{room}", room, client)
+        client.room = room
+        client.enqueue(f"Now talking in #{room}".encode())
+    elif command == '/leave' and room:
+        if room in client.rooms:
+            registry.leave(client, room)
+            broadcast(f"{client.username} has left #{room}", room)
+        if client.room == room:
+            client.room = next(iter(client.rooms), None)
+        client.enqueue(f"Left #{room}".encode())
+    elif command == '/rooms':
+        sizes = registry.room_sizes()
+        joined = ', '.join(f"#{name} ({sizes.get(name, 0)})" for name in sorted(client.rooms)) or 'none'
+        client.enqueue(f"Rooms: {joined} (talking in #{client.room})".encode())
+    elif command == '/who':
+        client.enqueue(f"Online: {', '.join(online_users())}".encode())
+    elif command == '/stats':
+        client.enqueue(format_stats().encode())
+    else:
+        client.enqueue(b"Commands: /join <room>, /leave <room>, /rooms, /who, /stats")
+
+def handle_client(conn, addr, **client_options):
+    """Handle individual client connection (options are passed on to ClientConnection)"""
     username = None
-    
+    client = None
+
     try:
+        # Framed clients are recognised by the zero byte that starts every frame
+        framed = is_framed(conn.recv(1, socket.MSG_PEEK))
+        receive = recv_frame if framed else (lambda sock: sock.recv(1024))
+
         # First message should be the username
-        initial_msg = conn.recv(1024).decode()
+        initial_msg = (receive(conn) or b'').decode()
         if initial_msg.startswith("USERNAME:"):
             username = initial_msg[9:]
-            with clients_lock:
-                clients[conn] = username
-            print(f"{username} connected from {addr}")
-            broadcast(f"{username} has joined the chat", conn)
         else:
             username = f"Guest_{addr[0]}_{addr[1]}"
-            with clients_lock:
-                clients[conn] = username
-            print(f"{username} connected from {addr}")
-            broadcast(f"{username} has joined the chat", conn)
-        
+        client = ClientConnection(conn, addr, username, framed=framed, **client_options)
+        registry.add(client)
+        announce('online', username)
+        print(f"{username} connected from {addr}")
+        handle_command(client, f"/join {DEFAULT_ROOM}")
+
         # Main message handling loop
         while True:
             try:
-                msg = conn.recv(1024)
-                if not msg:
+                msg = receive(conn)
+                if msg is None or (not framed and not msg):
                     break
-                    
+
                 decoded_msg = msg.decode()
-                print(f"{username}: {decoded_msg}")
-                broadcast(f"{username}: {decoded_msg}", conn)
-                
+                if decoded_msg.startswith('/'):
+                    handle_command(client, decoded_msg.strip())
+                elif client.room is None:
+                    client.enqueue(b"You are not in any room, use /join <room>")
+                else:
+                    print(f"[#{client.room}] {username}: {decoded_msg}")
+                    broadcast(f"[#{client.room}] {username}: {decoded_msg}", client.room, client)
+
             except ConnectionResetError:
                 break
-                
+
     except Exception as e:
         print(f"Error handling client {addr}: {e}")
-    
+
     finally:
         # Clean up when client disconnects
         print(f"{username} disconnected")
-        with clients_lock:
-            if conn in clients:
-                del clients[conn]
-        broadcast(f"{username} has left the chat")
+        if client is not None:
+            for room in registry.remove(client):
+                broadcast(f"{username} has left #{room}", room)
+            announce('offline', username)
+            client.close()
+            if client.dropped:
+                print(f"Dropped {client.dropped} messages for {username} while congested")
         conn.close()
 
-def main():
+def serve(args, node_id=None):
+    """Run one chat server process; with a node id it joins the relay bus"""
+    global registry, bus
+    registry = RoomRegistry(args.shards)
+
     HOST = '127.0.0.1'
-    PORT = 12345
-    
+    PORT = args.port
+    label = "Server" if node_id is None else f"Node {node_id}"
+    client_options = {
+        'policy': args.policy,
+        'high_watermark': args.high_watermark,
+        'low_watermark': args.low_watermark,
+        'evict_after': args.evict_after,
+    }
+
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     # Allow socket to be reused immediately after closing
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    
+    if node_id is not None:
+        # Every node listens on the same port; the kernel spreads new connections
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        bus = RelayBus(args.bus, node_id, handle_relay_event)
+        bus.start()
+
     try:
         server_socket.bind((HOST, PORT))
         server_socket.listen(5)
-        print(f"Server started on {HOST}:{PORT}")
+        print(f"{label} started on {HOST}:{PORT}")
         print("Waiting for connections...")
-        
+
         while True:
             try:
                 conn, addr = server_socket.accept()
-                client_thread = threading.Thread(target=handle_client, args=(conn, addr))
+                client_thread = threading.Thread(target=handle_client, args=(conn, addr),
+                                                 kwargs=client_options)
                 client_thread.daemon = True
                 client_thread.start()
             except KeyboardInterrupt:
-                print("\nShutting down server...")
+                print(f"\n{label} shutting down...")
                 break
             except Exception as e:
                 print(f"Error accepting connection: {e}")
-    
+
     except Exception as e:
         print(f"Server error: {e}")
-    
+
     finally:
         # Clean up all connections
-        with clients_lock:
-            for conn in list(clients.keys()):
-                try:
-                    conn.close()
-                except:
-                    pass
+        if bus is not None:
+            bus.close()
+        for client in registry.clients():
+            client.close()
+            try:
+                client.conn.close()
+            except:
+                pass
         server_socket.close()
-        print("Server shut down")
+        print(f"{label} shut down")
+        print(format_stats())
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-client TCP chat server")
+    parser.add_argument('--port', type=int, default=12345)
+    parser.add_argument('--high-watermark', type=int, default=HIGH_WATERMARK,
+                        help="Queued bytes per client that mark it congested")
+    parser.add_argument('--low-watermark', type=int, default=LOW_WATERMARK,
+                        help="Queued bytes a congested client must drain to before it recovers")
+    parser.add_argument('--evict-after', type=float, default=SLOW_EVICT_SECONDS,
+                        help="Seconds a client may stay congested before it is evicted")
+    parser.add_argument('--policy', choices=FULL_QUEUE_POLICIES, default=FULL_QUEUE_POLICY,
+                        help="What to do with messages for a congested client")
+    parser.add_argument('--shards', type=int, default=SHARD_COUNT,
+                        help="Independently locked registry shards")
+    parser.add_argument('--nodes', type=int, default=1,
+                        help="Start this many federated server processes sharing the port")
+    parser.add_argument('--node-id', help="Run a single federated node with this id (see --bus)")
+    parser.add_argument('--bus', default=os.path.join('/tmp', 'chat-tcp-bus'),
+                        help="Directory holding the nodes' Unix relay sockets")
+    args = parser.parse_args()
+
+    if args.node_id is not None:
+        serve(args, args.node_id)
+    elif args.nodes > 1:
+        nodes = [multiprocessing.Process(target=serve, args=(args, node_id))
+                 for node_id in range(args.nodes)]
+        for node in nodes:
+            node.start()
+        try:
+            for node in nodes:
+                node.join()
+        except KeyboardInterrupt:
+            # Ctrl+C also reached every node; wait for them to shut down cleanly
+            for node in nodes:
+                node.join()
+    else:
+        serve(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,67 @@
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+
+def run_worker(target, index, args, stats):
+    """Process entry point: leave shutdown to the supervisor, then run the worker"""
+    # Ctrl+C reaches the whole process group; let the supervisor decide when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    target(index, *args, stats)
+
+def serve_prefork(target, args, workers, fields, banner):
+    """
+    Supervise N worker processes sharing a SO_REUSEPORT port, restarting any that die.
+
+    Worker i runs target(i, *args, stats), where stats is a shared array of
+    len(fields) counters per worker, starting at i * len(fields). The
+    per-worker totals are printed on shutdown.
+    """
+    stats = multiprocessing.RawArray('Q', workers * len(fields))
+    restarts = [0] * workers
+    processes = {}
+    started = {}  # Worker index -> monotonic time of its latest start
+    # Treat SIGTERM like Ctrl+C so the summary is still printed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    def spawn(index):
+        process = multiprocessing.Process(target=run_worker, args=(target, index, args, stats), daemon=True)
+        process.start()
+        started[index] = time.monotonic()
+        processes[index] = process
+
+    for index in range(workers):
+        spawn(index)
+    print(f"{banner} [supervisor pid {os.getpid()}]")
+
+    try:
+        while True:
+            sentinels = {p.sentinel: i for i, p in processes.items()}
+            for sentinel in multiprocessing.connection.wait(list(sentinels)):
+                index = sentinels[sentinel]
+                dead = processes[index]
+                dead.join()
+                print(f"Worker {index} (pid {dead.pid}) exited with code {dead.exitcode}, restarting")
+                # Back off if the worker cannot even start (e.g. port not available)
+                if time.monotonic() - started[index] < 1:
+                    time.sleep(1)
+                restarts[index] += 1
+                spawn(index)
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+        print_worker_stats(stats, restarts, fields)
+
+def print_worker_stats(stats, restarts, fields):
+    """Per-worker summary printed when the supervisor shuts down"""
+    print(f"{'worker':>6}{'restarts':>10}" + ''.join(f"{name:>14}" for name in fields))
+    totals = [0] * len(fields)
+    for index, restart_count in enumerate(restarts):
+        values = stats[index * len(fields):(index + 1) * len(fields)]
+        totals = [t + v for t, v in zip(totals, values)]
+        print(f"{index:>6}{restart_count:>10}" + ''.join(f"{v:>14}" for v in values))
+    print(f"{'total':>6}{sum(restarts):>10}" + ''.join(f"{v:>14}" for v in totals))
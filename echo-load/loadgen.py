@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import deque
+
+DEFAULT_PORTS = {'tcp': 65432, 'udp': 65433}
+# UDP payloads start with a zero-padded sequence number so replies can be matched
+SEQ_WIDTH = 16
+
+class LatencyRecorder:
+    """Collects latencies and summarizes them as percentiles and a log2 histogram"""
+
+    def __init__(self):
+        self.samples = []
+        self.bytes = 0
+        self.errors = 0
+
+    def record(self, seconds, size):
+        self.samples.append(seconds)
+        self.bytes += size
+
+    def percentile(self, pct):
+        """Nearest-rank percentile in milliseconds (samples must be sorted)"""
+        if not self.samples:
+            return 0.0
+        index = min(len(self.samples) - 1, int(len(self.samples) * pct / 100))
+        return self.samples[index] * 1000
+
+    def histogram(self):
+        """Bucket counts keyed by upper bound in microseconds (powers of two)"""
+        buckets = {}
+        for seconds in self.samples:
+            bound = 1
+            micros = seconds * 1e6
+            while bound < micros:
+                bound <<= 1
+            buckets[bound] = buckets.get(bound, 0) + 1
+        return {f"<={bound}us": buckets[bound] for bound in sorted(buckets)}
+
+    def summary(self, elapsed):
+        self.samples.sort()
+        count = len(self.samples)
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'seconds': round(elapsed, 3),
+            'req_per_s': round(count / elapsed, 1) if elapsed else 0.0,
+            'mb_per_s': round(self.bytes / elapsed / 1e6, 3) if elapsed else 0.0,
+            'latency_ms': {
+                'p50': round(self.percentile(50), 3),
+                'p90': round(self.percentile(90), 3),
+                'p99': round(self.percentile(99), 3),
+                'p999': round(self.percentile(99.9), 3),
+                'max': round(self.samples[-1] * 1000, 3) if count else 0.0,
+            },
+            'histogram': self.histogram(),
+        }
+
+def make_payloads(sizes):
+    """Cycle through the requested payload sizes"""
+    return itertools.cycle([b'x' * size for size in sizes])
+
+def schedule(rate, deadline):
+    """Open-loop send times for one flow, spaced evenly at `rate` per second"""
+    interval = 1.0 / rate
+    next_time = time.perf_counter()
+    while next_time < deadline:
+        yield next_time
+        next_time += interval
+
+async def sleep_until(when):
+    delay = when - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+async def until(awaitable, when):
+    """Await with a hard deadline (perf_counter time); raises asyncio.TimeoutError past it"""
+    return await asyncio.wait_for(awaitable, max(0.0, when - time.perf_counter()))
+
+async def tcp_flow(args, recorder, deadline, flow_rate):
+    """One TCP connection, closed loop (one request in flight) or open loop (pipelined)"""
+    # A server that stops replying must not keep the run going past --duration
+    # plus the --timeout grace for the last replies
+    read_deadline = deadline + args.timeout
+    reader, writer = await until(asyncio.open_connection(args.host, args.port), read_deadline)
+    payloads = make_payloads(args.size)
+    sender = None
+    in_flight = deque()
+    try:
+        if flow_rate is None:
+            while time.perf_counter() < deadline:
+                payload = next(payloads)
+                start = time.perf_counter()
+                writer.write(payload)
+                in_flight.append((start, len(payload)))
+                await until(reader.readexactly(len(payload)), read_deadline)
+                in_flight.popleft()
+                recorder.record(time.perf_counter() - start, len(payload))
+            return
+
+        # Open loop: latency is measured from the intended send time, so a
+        # stalled server shows up as queueing delay instead of a lower rate
+        done_sending = False
+        # Set whenever a request goes out (or sending ends); the reader sleeps on
+        # it while nothing is in flight, i.e. until the next scheduled send
+        sent = asyncio.Event()
+
+        async def send():
+            nonlocal done_sending
+            for intended in schedule(flow_rate, deadline):
+                await sleep_until(intended)
+                payload = next(payloads)
+                in_flight.append((intended, len(payload)))
+                writer.write(payload)
+                sent.set()
+            done_sending = True
+            sent.set()
+
+        sender = asyncio.create_task(send())
+        while not (done_sending and not in_flight):
+            if not in_flight:
+                sent.clear()
+                await sent.wait()
+                continue
+            intended, size = in_flight[0]
+            await until(reader.readexactly(size), read_deadline)
+            in_flight.popleft()
+            recorder.record(time.perf_counter() - intended, size)
+        await sender
+    except asyncio.TimeoutError:
+        # Replies still outstanding at the read deadline are lost
+        recorder.errors += max(1, len(in_flight))
+    except (ConnectionError, asyncio.IncompleteReadError):
+        recorder.errors += 1
+    finally:
+        if sender is not None:
+            sender.cancel()
+        writer.close()
+
+class UDPFlow(asyncio.DatagramProtocol):
+    """One UDP flow; replies are matched to requests by sequence number"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.pending = {}
+        self.waiter = None
+        self.seq = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, payload, intended):
+        self.seq += 1
+        self.pending[self.seq] = intended
+        self.transport.sendto(b'%0*d' % (SEQ_WIDTH, self.seq) + payload[SEQ_WIDTH:])
+        return self.seq
+
+    def datagram_received(self, data, addr):
+        intended = self.pending.pop(int(data[:SEQ_WIDTH]), None)
+        if intended is None:
+            return  # Late reply for a request already counted as lost
+        self.recorder.record(time.perf_counter() - intended, len(data))
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+async def udp_flow(args, recorder, deadline, flow_rate):
+    """One UDP flow, closed loop (wait for each reply) or open loop (fire on schedule)"""
+    loop = asyncio.get_running_loop()
+    transport, flow = await loop.create_datagram_endpoint(lambda: UDPFlow(recorder),
+                                                          remote_addr=(args.host, args.port))
+    payloads = make_payloads(args.size)
+    try:
+        if flow_rate is None:
+            while time.perf_counter() < deadline:
+                flow.waiter = loop.create_future()
+                seq = flow.send(next(payloads), time.perf_counter())
+                try:
+                    await asyncio.wait_for(flow.waiter, args.timeout)
+                except asyncio.TimeoutError:
+                    flow.pending.pop(seq, None)
+                    recorder.errors += 1
+        else:
+            for intended in schedule(flow_rate, deadline):
+                await sleep_until(intended)
+                flow.send(next(payloads), intended)
+            # Give the last replies a chance, then count the rest as lost
+            await asyncio.sleep(args.timeout)
+            recorder.errors += len(flow.pending)
+    finally:
+        transport.close()
+
+async def run(args):
+    recorder = LatencyRecorder()
+    flow = tcp_flow if args.proto == 'tcp' else udp_flow
+    flow_rate = args.rate / args.connections if args.rate else None
+    start = time.perf_counter()
+    deadline = start + args.duration
+    results = await asyncio.gather(*(flow(args, recorder, deadline, flow_rate)
+                                     for _ in range(args.connections)), return_exceptions=True)
+    # Rates cover the load window only, not the final wait for stragglers
+    elapsed = min(time.perf_counter(), deadline) - start
+    for result in results:
+        if isinstance(result, Exception):
+            recorder.errors += 1
+    return recorder.summary(elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the echo-tcp and echo-udp servers")
+    parser.add_argument('proto', choices=['tcp', 'udp'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="Defaults to 65432 for tcp, 65433 for udp")
+    parser.add_argument('--connections', type=int, default=10, help="Concurrent TCP connections or UDP flows")
+    parser.add_argument('--rate', type=float, help="Open loop: total requests/s across all flows "
+                                                   "(default is closed loop, one request in flight per flow)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds to generate load")
+    parser.add_argument('--size', type=int, nargs='+', default=[64], help="Payload size(s) in bytes, cycled")
+    parser.add_argument('--timeout', type=float, default=1.0, help="UDP reply timeout in seconds; for TCP, how long "
+                                                                   "after --duration to wait for the last replies")
+    parser.add_argument('--label', help="Free-form tag stored in the report, e.g. the server mode")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+    args.port = args.port or DEFAULT_PORTS[args.proto]
+    if args.proto == 'udp' and min(args.size) < SEQ_WIDTH:
+        parser.error(f"UDP payloads must be at least {SEQ_WIDTH} bytes (sequence number header)")
+
+    summary = asyncio.run(run(args))
+
+    report = {
+        'label': args.label,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'proto': args.proto, 'host': args.host, 'port': args.port,
+            'connections': args.connections, 'rate': args.rate,
+            'loop': 'open' if args.rate else 'closed',
+            'duration': args.duration, 'sizes': args.size,
+        },
+        **summary,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nLoad generator stopped")
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+
+def wait_for_port(host, port, timeout=5.0):
+    """Poll until the server accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server on {host}:{port} did not come up")
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+async def client(host, port, payload, requests, latencies):
+    """One connection doing request/response round trips"""
+    reader, writer = await asyncio.open_connection(host, port)
+    expected = payload.upper()
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(payload)
+            await reader.readexactly(len(expected))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def run_load(host, port, connections, requests, size):
+    payload = b'x' * size
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, payload, requests, latencies)
+                           for _ in range(connections)))
+    return time.perf_counter() - start, latencies
+
+def bench_mode(mode, args):
+    """Start server.py in the given mode, drive it, then stop it"""
+    server = subprocess.Popen([sys.executable, SERVER, '--mode', mode,
+                               '--host', args.host, '--port', str(args.port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.host, args.port)
+        elapsed, latencies = asyncio.run(run_load(args.host, args.port, args.connections,
+                                                  args.requests, args.size))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        'mode': mode,
+        'requests': total,
+        'seconds': elapsed,
+        'req_per_s': total / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the blocking and asyncio echo-tcp servers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=65442)  # Separate port so a running server is not disturbed
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help="Round trips per connection")
+    parser.add_argument('--size', type=int, default=64, help="Payload size in bytes")
+    parser.add_argument('--modes', nargs='+', default=['blocking', 'asyncio'])
+    args = parser.parse_args()
+
+    print(f"{args.connections} connections x {args.requests} requests, {args.size}-byte payload")
+    print(f"{'mode':<10}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}")
+    for mode in args.modes:
+        result = bench_mode(mode, args)
+        print(f"{result['mode']:<10}{result['req_per_s']:>12.0f}{result['p50_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['seconds']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,116 @@
+import argparse
+import asyncio
+import os
 import socket
+import sys
 
-def main():
-    # Server configuration
-    host = '127.0.0.1'  # localhost
-    port = 65432        # Port to listen on (non-privileged ports are > 1023)
-    
+# The prefork supervisor lives in echo-common, shared with the echo-udp server
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'echo-common'))
+from prefork import serve_prefork
+
+# Per-worker counters kept in shared memory so they survive worker restarts
+STATS_FIELDS = ('connections', 'messages', 'bytes')
+
+def capitalize(data):
+    """Uppercase a received chunk, skipping the str round trip for plain ASCII"""
+    if data.isascii():
+        return data.upper()
+    return data.decode().upper().encode()
+
+def serve_blocking(host, port):
+    """Original loop: serve one client at a time until it disconnects"""
     # Create a TCP socket
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
         # Bind the socket to the address
         server_socket.bind((host, port))
         # Enable the server to accept connections
         server_socket.listen()
-        
+
         print(f"TCP Server is listening on {host}:{port}")
-        
+
         while True:
             # Wait for a connection
             client_socket, client_address = server_socket.accept()
             print(f"Connected by {client_address}")
-            
+
             with client_socket:
                 while True:
                     # Receive data from the client
                     data = client_socket.recv(1024)
                     if not data:
                         break
-                    
+
                     # Print received message
                     print(f"Received: {data.decode()}")
-                    
+
                     # Capitalize the message and send it back
-                    capitalized_data = data.decode().upper().encode()
+                    capitalized_data = capitalize(data)
                     client_socket.sendall(capitalized_data)
                     print(f"Sent: {capitalized_data.decode()}")
-            
+
             print(f"Connection with {client_address} closed")
 
+class EchoProtocol(asyncio.Protocol):
+    """Per-connection protocol for the asyncio engine (no printing on the data path)"""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(capitalize(data))
+
+class CountingEchoProtocol(EchoProtocol):
+    """EchoProtocol that also records traffic in a worker's stats slot"""
+
+    def __init__(self, stats, base):
+        self.stats = stats
+        self.base = base
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self.stats[self.base] += 1
+
+    def data_received(self, data):
+        self.stats[self.base + 1] += 1
+        self.stats[self.base + 2] += len(data)
+        super().data_received(data)
+
+async def serve_asyncio(host, port, backlog=4096, reuse_port=False, protocol_factory=EchoProtocol):
+    """Serve every client concurrently from a single event loop"""
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(protocol_factory, host, port, reuse_address=True,
+                                      reuse_port=reuse_port, backlog=backlog)
+    if not reuse_port:
+        print(f"TCP Server (asyncio) is listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def worker(index, host, port, stats):
+    """Worker process: its own SO_REUSEPORT listener driven by the asyncio engine"""
+    base = index * len(STATS_FIELDS)
+    asyncio.run(serve_asyncio(host, port, reuse_port=True,
+                              protocol_factory=lambda: CountingEchoProtocol(stats, base)))
+
+def main():
+    parser = argparse.ArgumentParser(description="TCP server that echoes messages capitalized")
+    parser.add_argument('--host', default='127.0.0.1')  # localhost
+    parser.add_argument('--port', type=int, default=65432)  # Port to listen on (non-privileged ports are > 1023)
+    parser.add_argument('--mode', choices=['blocking', 'asyncio', 'prefork'], default='blocking',
+                        help="blocking: one client at a time; asyncio: many concurrent clients; "
+                             "prefork: asyncio workers on every core via SO_REUSEPORT")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes for prefork mode")
+    args = parser.parse_args()
+
+    if args.mode == 'prefork':
+        serve_prefork(worker, (args.host, args.port), args.workers, STATS_FIELDS,
+                      f"TCP Server (prefork, {args.workers} workers) is listening on {args.host}:{args.port}")
+    elif args.mode == 'asyncio':
+        asyncio.run(serve_asyncio(args.host, args.port))
+    else:
+        serve_blocking(args.host, args.port)
+
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\nServer shutting down...")
\ No newline at end of file
+        print("\nServer shutting down...")
@@ -25,7 +25,7 @@ def main():
             
             try:
                 # Receive the response from the server
-                data, server = client_socket.recvfrom(1024)
+                data, server = client_socket.recvfrom(65535)
                 
                 # Print the response
                 print(f"Received: {data.decode()}")
@@ -1,33 +1,112 @@
+import argparse
+import os
 import socket
+import string
+import sys
 
-def main():
-    # Server configuration
-    host = '127.0.0.1'  # localhost
-    port = 65433        # Different port from TCP server
-    
+# The prefork supervisor lives in echo-common, shared with the echo-tcp server
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'echo-common'))
+from prefork import serve_prefork
+
+# Largest UDP payload; the high-rate path never truncates
+MAX_DATAGRAM = 65535
+UPPER_TABLE = bytes.maketrans(string.ascii_lowercase.encode(), string.ascii_uppercase.encode())
+
+# Per-worker counters kept in shared memory so they survive worker restarts
+STATS_FIELDS = ('datagrams', 'bytes')
+
+def capitalize(data):
+    """Uppercase a datagram, skipping the str round trip for plain ASCII"""
+    if data.isascii():
+        return data.upper()
+    return data.decode().upper().encode()
+
+def serve_blocking(host, port):
+    """Original loop: receive, print and echo one datagram at a time"""
     # Create a UDP socket
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server_socket:
         # Bind the socket to the address
         server_socket.bind((host, port))
-        
+
         print(f"UDP Server is listening on {host}:{port}")
-        
+
         while True:
             # Receive data and address from client
             data, client_address = server_socket.recvfrom(1024)
-            
+
             # Print received message
             print(f"Received from {client_address}: {data.decode()}")
-            
+
             # Capitalize the message
-            capitalized_data = data.decode().upper().encode()
-            
+            capitalized_data = capitalize(data)
+
             # Send capitalized data back to client
             server_socket.sendto(capitalized_data, client_address)
             print(f"Sent to {client_address}: {capitalized_data.decode()}")
 
+def serve_fast(host, port, batch_size=32, reuse_port=False, stats=None, base=0):
+    """High-rate loop: preallocated receive buffers, ASCII uppercase via translate, batched replies"""
+    buffers = [bytearray(MAX_DATAGRAM) for _ in range(batch_size)]
+    views = [memoryview(buffer) for buffer in buffers]
+    lengths = [0] * batch_size
+    addresses = [None] * batch_size
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server_socket:
+        if reuse_port:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # A deeper receive queue absorbs bursts between batches
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        server_socket.bind((host, port))
+        if not reuse_port:
+            print(f"UDP Server (fast) is listening on {host}:{port}")
+
+        recv_into = server_socket.recvfrom_into
+        sendto = server_socket.sendto
+        while True:
+            # Block for the first datagram, then drain whatever else is already queued
+            lengths[0], addresses[0] = recv_into(views[0])
+            count = 1
+            while count < batch_size:
+                try:
+                    lengths[count], addresses[count] = recv_into(views[count], 0, socket.MSG_DONTWAIT)
+                except BlockingIOError:
+                    break
+                count += 1
+
+            # Uppercase ASCII at the byte level (non-ASCII bytes pass through unchanged).
+            # Python has no sendmmsg, so the replies go out as sequential sendto calls
+            for i in range(count):
+                sendto(buffers[i][:lengths[i]].translate(UPPER_TABLE), addresses[i])
+
+            if stats is not None:
+                stats[base] += count
+                stats[base + 1] += sum(lengths[:count])
+
+def worker(index, host, port, stats):
+    """Worker process: the high-rate loop on its own SO_REUSEPORT socket"""
+    serve_fast(host, port, reuse_port=True, stats=stats, base=index * len(STATS_FIELDS))
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP server that echoes messages capitalized")
+    parser.add_argument('--host', default='127.0.0.1')  # localhost
+    parser.add_argument('--port', type=int, default=65433)  # Different port from TCP server
+    parser.add_argument('--mode', choices=['blocking', 'fast', 'prefork'], default='blocking',
+                        help="blocking: print every datagram; fast: batched high-rate loop; "
+                             "prefork: fast loop in a worker per core via SO_REUSEPORT")
+    parser.add_argument('--batch', type=int, default=32, help="Datagrams drained per batch in fast mode")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes for prefork mode")
+    args = parser.parse_args()
+
+    if args.mode == 'prefork':
+        serve_prefork(worker, (args.host, args.port), args.workers, STATS_FIELDS,
+                      f"UDP Server (prefork, {args.workers} workers) is listening on {args.host}:{args.port}")
+    elif args.mode == 'fast':
+        serve_fast(args.host, args.port, args.batch)
+    else:
+        serve_blocking(args.host, args.port)
+
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\nServer shutting down...")
\ No newline at end of file
+        print("\nServer shutting down...")
@@ -1,68 +1,387 @@
-import random
-
-def xor(a: str, b: str) -> str:
-    """Perform XOR between two binary strings a and b of equal length."""
-    return ''.join('0' if x == y else '1' for x, y in zip(a, b))
-
-
-def compute_crc(data: str, poly: str) -> str:
-    """Compute CRC remainder for given data string and generator polynomial, with step logging."""
-    poly_len = len(poly)
-    # Append zeros
-    padded = data + '0' * (poly_len - 1)
-    div = padded[:poly_len]
-
-    for i in range(poly_len, len(padded) + 1):
-        print(f"Div: {div}")
-        # Choose divisor
-        if div[0] == '1':
-            div = xor(div, poly)
-        else:
-            div = xor(div, '0' * poly_len)
-        # Shift in next bit
-        if i < len(padded):
-            div = div[1:] + padded[i]
-        else:
-            div = div[1:]
-    print(f"Final remainder: {div}")
-    return div
-
-
-def flip_random_bit(bitstring: str) -> tuple[str, int]:
-    """Flip a random bit in the given bitstring and return new string and index."""
-    pos = random.randrange(len(bitstring))
-    flipped = list(bitstring)
-    flipped[pos] = '1' if bitstring[pos] == '0' else '0'
-    return ''.join(flipped), pos
-
-
-def main():
-    data = input("\nEnter binary data: ").strip()
-    poly = input("Enter generator polynomial (binary): ").strip()
-
-    # Compute CRC with logging
-    crc = compute_crc(data, poly)
-    transmitted = data + crc
-    print(f"\nComputed CRC: {crc}")
-    print(f"Transmitted frame: {transmitted}\n")
-
-    # Ask whether to inject error
-    choice = input("Inject error? (y/n): ").strip().lower()
-    if choice == 'y':
-        frame, pos = flip_random_bit(transmitted)
-        print(f"Error injected at position {pos}: {frame}\n")
-    else:
-        frame = transmitted
-        print("No error injected.\n")
-
-    # Check at receiver with logging
-    print("Checking received frame:")
-    recv_remainder = compute_crc(frame, poly)
-    print(f"\nRemainder at receiver: {recv_remainder}")
-    if set(recv_remainder) == {'0'}:
-        print("No error detected.")
-    else:
-        print("Error detected in received frame!")
-
-if __name__ == "__main__":
-    main()
+import binascii
+import mmap
+import os
+import random
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+
+# Bytes per task when checksumming a file in a process pool
+CRC_FILE_CHUNK = 16 * 1024 * 1024
+
+def xor(a: str, b: str) -> str:
+    """Perform XOR between two binary strings a and b of equal length."""
+    return ''.join('0' if x == y else '1' for x, y in zip(a, b))
+
+
+@lru_cache(maxsize=None)
+def crc_table(width: int, poly: int) -> tuple[int, ...]:
+    """
+    256-entry table for a CRC of the given width: entry b is the register after
+    shifting byte b through an all-zero register (MSB first).
+    `poly` holds the generator without its leading x^width term.
+    Widths below 8 run in a register widened to 8 bits, poly shifted to match.
+    """
+    shift = max(width, 8)
+    top = 1 << (shift - 1)
+    mask = (1 << shift) - 1
+    poly <<= shift - width
+    table = []
+    for byte in range(256):
+        reg = byte << (shift - 8)
+        for _ in range(8):
+            reg = ((reg << 1) ^ poly) & mask if reg & top else (reg << 1) & mask
+        table.append(reg)
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def crc_slice8_tables(width: int, poly: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Slicing-by-8 tables: tables[k][b] is the register after byte b followed by
+    k zero bytes, so 8 input bytes fold into the register with 8 lookups.
+    """
+    shift = max(width, 8)
+    mask = (1 << shift) - 1
+    base = crc_table(width, poly)
+    tables = [base]
+    for _ in range(7):
+        previous = tables[-1]
+        # One more zero byte after the previous table's state
+        tables.append(tuple(((reg << 8) & mask) ^ base[reg >> (shift - 8)] for reg in previous))
+    return tuple(tables)
+
+
+def crc_bits(bits: str, width: int, poly: int, crc: int = 0) -> int:
+    """Feed a '0'/'1' string through the CRC register one bit at a time (for non-byte-aligned input)."""
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    for bit in bits:
+        feedback = bool(crc & top) ^ (bit == '1')
+        crc = (crc << 1) & mask
+        if feedback:
+            crc ^= poly
+    return crc
+
+
+def crc_bytes(data, width: int, poly: int, crc: int = 0) -> int:
+    """
+    Table-driven CRC of bytes-like data, MSB first (no reflection, no final XOR).
+    `crc` is the register to start from, so calls can be chained over chunks.
+    """
+    table = crc_table(width, poly)
+    shift = max(width, 8)
+    mask = (1 << shift) - 1
+    down = shift - 8
+    reg = crc << (shift - width)
+    for byte in memoryview(data).cast('B'):
+        reg = ((reg << 8) & mask) ^ table[(reg >> down) ^ byte]
+    return reg >> (shift - width)
+
+
+def crc_slice8(data, width: int, poly: int, crc: int = 0) -> int:
+    """
+    Same result as crc_bytes, consuming 8 bytes per step (slicing-by-8).
+    Registers wider than 64 bits do not fit one step and use crc_bytes.
+    """
+    if width > 64:
+        return crc_bytes(data, width, poly, crc)
+    view = memoryview(data).cast('B')
+    whole = len(view) - len(view) % 8
+    t0, t1, t2, t3, t4, t5, t6, t7 = crc_slice8_tables(width, poly)
+    shift = max(width, 8)
+    up = 64 - shift
+    reg = crc << (shift - width)
+    for (word,) in struct.iter_unpack('>Q', view[:whole]):
+        word ^= reg << up
+        reg = (t7[word >> 56] ^ t6[(word >> 48) & 0xFF] ^ t5[(word >> 40) & 0xFF] ^ t4[(word >> 32) & 0xFF] ^
+               t3[(word >> 24) & 0xFF] ^ t2[(word >> 16) & 0xFF] ^ t1[(word >> 8) & 0xFF] ^ t0[word & 0xFF])
+    return crc_bytes(view[whole:], width, poly, reg >> (shift - width))
+
+
+def gf2_mulmod(a: int, b: int, width: int, poly: int) -> int:
+    """Product of two polynomials modulo the generator x^width + poly, over GF(2)."""
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    result = 0
+    for i in range(b.bit_length() - 1, -1, -1):
+        # result = result * x (mod P), then add a if bit i of b is set
+        result = ((result << 1) & mask) ^ poly if result & top else (result << 1) & mask
+        if b >> i & 1:
+            result ^= a
+    return result
+
+
+def gf2_mod(value: int, width: int, poly: int) -> int:
+    """Remainder of a polynomial modulo the generator x^width + poly, over GF(2)."""
+    generator = poly | 1 << width
+    for i in range(value.bit_length() - 1, width - 1, -1):
+        if value >> i & 1:
+            value ^= generator << (i - width)
+    return value
+
+
+def xpow8n(length: int, width: int, poly: int) -> int:
+    """x^(8 * length) modulo the generator, by square-and-multiply."""
+    result = 1
+    base = gf2_mod(1 << 8, width, poly)
+    while length:
+        if length & 1:
+            result = gf2_mulmod(result, base, width, poly)
+        base = gf2_mulmod(base, base, width, poly)
+        length >>= 1
+    return result
+
+
+def crc_combine(crc_a: int, crc_b: int, len_b: int, width: int, poly: int) -> int:
+    """
+    CRC of A followed by B, from CRC(A), CRC(B) and the byte length of B.
+    Feeding len_b zero bytes multiplies the register by x^(8 * len_b), and
+    the CRC is linear, so CRC(A + B) = CRC(A) * x^(8 * len_b) + CRC(B) mod P.
+    Costs O(log len_b) polynomial products instead of touching B again.
+    """
+    return gf2_mulmod(crc_a, xpow8n(len_b, width, poly), width, poly) ^ crc_b
+
+
+class CRCHash:
+    """
+    Incremental CRC with a hashlib-style interface.
+
+        crc = CRCHash(32, 0x04C11DB7)
+        crc.update(first_chunk)
+        crc.update(second_chunk)
+        crc.digest()      # big-endian bytes, crc.crcvalue as an int
+
+    `poly` is the generator without its leading x^width term.
+    """
+
+    def __init__(self, width: int, poly: int, data=b''):
+        self.width = width
+        self.poly = poly
+        self.crcvalue = 0
+        self.length = 0  # Bytes fed so far
+        if data:
+            self.update(data)
+
+    @property
+    def name(self) -> str:
+        return f"crc{self.width}-{self.poly:x}"
+
+    @property
+    def digest_size(self) -> int:
+        return (self.width + 7) // 8
+
+    def update(self, data) -> None:
+        self.crcvalue = crc_slice8(data, self.width, self.poly, self.crcvalue)
+        self.length += memoryview(data).nbytes
+
+    def digest(self) -> bytes:
+        return self.crcvalue.to_bytes(self.digest_size, 'big')
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self) -> 'CRCHash':
+        clone = CRCHash(self.width, self.poly)
+        clone.crcvalue = self.crcvalue
+        clone.length = self.length
+        return clone
+
+    def combine(self, crc_a: int, crc_b: int, len_b: int) -> int:
+        """CRC of two concatenated pieces under this object's polynomial (see crc_combine)."""
+        return crc_combine(crc_a, crc_b, len_b, self.width, self.poly)
+
+
+def _crc_file_chunk(path: str, start: int, end: int, width: int, poly: int) -> int:
+    """Worker: CRC of one byte range of a file, read through mmap."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        with memoryview(data) as view:  # Released before the map closes
+            return crc_slice8(view[start:end], width, poly)
+
+
+def crc_file(path: str, width: int, poly: int, workers: int | None = None,
+             chunk_size: int = CRC_FILE_CHUNK) -> int:
+    """
+    CRC of a whole file: chunks are checksummed in a process pool and
+    merged in order with crc_combine.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return 0
+    ranges = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        crcs = pool.map(_crc_file_chunk, [path] * len(ranges), [start for start, _ in ranges],
+                        [end for _, end in ranges], [width] * len(ranges), [poly] * len(ranges))
+        crc = 0
+        for (start, end), chunk_crc in zip(ranges, crcs):
+            crc = crc_combine(crc, chunk_crc, end - start, width, poly)
+    return crc
+
+
+# Byte b with its bit order reversed, for bytes.translate
+REFLECT_BYTE = bytes(int(f'{b:08b}'[::-1], 2) for b in range(256))
+
+# Standard check input: every preset's `check` is its CRC of these bytes
+CHECK_INPUT = b'123456789'
+
+
+def reflect(value: int, width: int) -> int:
+    """Reverse the low `width` bits of value."""
+    return int(format(value, f'0{width}b')[::-1], 2)
+
+
+class CRCPreset(NamedTuple):
+    """
+    A CRC in the Rocksoft model: the register starts at `init`, input bytes
+    are bit-reversed if `refin`, the final register is bit-reversed if
+    `refout` and XORed with `xorout`. `poly` excludes the leading x^width term.
+    """
+    name: str
+    width: int
+    poly: int
+    init: int
+    refin: bool
+    refout: bool
+    xorout: int
+    check: int
+
+    def compute(self, data) -> int:
+        """CRC of bytes-like data, through a C fast path when one matches."""
+        fast = fast_path(self)
+        return fast(data) if fast else self.compute_table(data)
+
+    def compute_table(self, data) -> int:
+        """CRC of bytes-like data through the table engine, bypassing any fast path."""
+        if self.refin:
+            data = bytes(data).translate(REFLECT_BYTE)
+        reg = crc_slice8(data, self.width, self.poly, self.init)
+        if self.refout:
+            reg = reflect(reg, self.width)
+        return reg ^ self.xorout
+
+
+CRC_PRESETS = {preset.name: preset for preset in (
+    CRCPreset('CRC-8', 8, 0x07, 0x00, False, False, 0x00, 0xF4),
+    CRCPreset('CRC-16/CCITT-FALSE', 16, 0x1021, 0xFFFF, False, False, 0x0000, 0x29B1),
+    CRCPreset('CRC-16/ARC', 16, 0x8005, 0x0000, True, True, 0x0000, 0xBB3D),
+    CRCPreset('CRC-32', 32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF, 0xCBF43926),
+    CRCPreset('CRC-32C', 32, 0x1EDC6F41, 0xFFFFFFFF, True, True, 0xFFFFFFFF, 0xE3069283),
+    CRCPreset('CRC-64/XZ', 64, 0x42F0E1EBA9EA3693, 0xFFFFFFFFFFFFFFFF, True, True,
+              0xFFFFFFFFFFFFFFFF, 0x995DC9BBDF1939FA),
+)}
+
+
+@lru_cache(maxsize=None)
+def fast_path(preset: CRCPreset):
+    """zlib/binascii function computing this preset, or None if neither matches."""
+    params = preset[1:-1]
+    if params == (32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF):
+        return zlib.crc32
+    # crc_hqx is the plain MSB-first CRC-16 with generator 0x1021 and any initial register
+    if params[:2] == (16, 0x1021) and not preset.refin and not preset.refout:
+        return lambda data: binascii.crc_hqx(data, preset.init) ^ preset.xorout
+    return None
+
+
+def crc(data, preset: str | CRCPreset) -> int:
+    """CRC of bytes-like data under a preset, given by name (see CRC_PRESETS) or as a CRCPreset."""
+    if isinstance(preset, str):
+        preset = CRC_PRESETS[preset]
+    return preset.compute(data)
+
+
+def check_presets() -> list[tuple[str, int, int]]:
+    """
+    Run every preset over CHECK_INPUT, both through its fast path (if any)
+    and the table engine. Returns (name, expected, got) for each mismatch.
+    """
+    failures = []
+    for preset in CRC_PRESETS.values():
+        for got in {preset.compute(CHECK_INPUT), preset.compute_table(CHECK_INPUT)}:
+            if got != preset.check:
+                failures.append((preset.name, preset.check, got))
+    return failures
+
+
+def compute_crc(data: str, poly: str) -> str:
+    """
+    Compute CRC remainder for given data string and generator polynomial.
+    Thin wrapper over the byte-wise engine; returns the same remainder as
+    the long division in compute_crc_steps.
+    """
+    width = len(poly) - 1
+    if width < 1:
+        return ''
+    generator = int(poly, 2) & ((1 << width) - 1)
+    # Bits in front of the last whole bytes go one at a time
+    lead = len(data) % 8
+    crc = crc_bits(data[:lead], width, generator)
+    body = data[lead:]
+    if body:
+        crc = crc_slice8(int(body, 2).to_bytes(len(body) // 8, 'big'), width, generator, crc)
+    return format(crc, f'0{width}b')
+
+
+def compute_crc_steps(data: str, poly: str) -> str:
+    """Compute CRC remainder for given data string and generator polynomial, with step logging."""
+    poly_len = len(poly)
+    # Append zeros
+    padded = data + '0' * (poly_len - 1)
+    div = padded[:poly_len]
+
+    for i in range(poly_len, len(padded) + 1):
+        print(f"Div: {div}")
+        # Choose divisor
+        if div[0] == '1':
+            div = xor(div, poly)
+        else:
+            div = xor(div, '0' * poly_len)
+        # Shift in next bit
+        if i < len(padded):
+            div = div[1:] + padded[i]
+        else:
+            div = div[1:]
+    print(f"Final remainder: {div}")
+    return div
+
+
+def flip_random_bit(bitstring: str) -> tuple[str, int]:
+    """Flip a random bit in the given bitstring and return new string and index."""
+    pos = random.randrange(len(bitstring))
+    flipped = list(bitstring)
+    flipped[pos] = '1' if bitstring[pos] == '0' else '0'
+    return ''.join(flipped), pos
+
+
+def main():
+    data = input("\nEnter binary data: ").strip()
+    poly = input("Enter generator polynomial (binary): ").strip()
+
+    # Compute CRC with logging
+    crc = compute_crc_steps(data, poly)
+    transmitted = data + crc
+    print(f"\nComputed CRC: {crc}")
+    print(f"Transmitted frame: {transmitted}\n")
+
+    # Ask whether to inject error
+    choice = input("Inject error? (y/n): ").strip().lower()
+    if choice == 'y':
+        frame, pos = flip_random_bit(transmitted)
+        print(f"Error injected at position {pos}: {frame}\n")
+    else:
+        frame = transmitted
+        print("No error injected.\n")
+
+    # Check at receiver with logging
+    print("Checking received frame:")
+    recv_remainder = compute_crc_steps(frame, poly)
+    print(f"\nRemainder at receiver: {recv_remainder}")
+    if set(recv_remainder) == {'0'}:
+        print("No error detected.")
+    else:
+        print("Error detected in received frame!")
+
+if __name__ == "__main__":
+    main()
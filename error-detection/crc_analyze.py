@@ -0,0 +1,288 @@
+import argparse
+import math
+import random
+import time
+from itertools import combinations
+import numpy as np
+from CRC import CRC_PRESETS
+
+# Generators up to this wide get their full weight distribution from the dual
+# code (2^width dual codewords, one Walsh-Hadamard transform)
+DUAL_MAX_WIDTH = 24
+
+# Wider generators count weight-k patterns by enumeration; weights whose
+# enumeration would take more syndrome lookups than this are left uncounted
+MAX_LOOKUPS = 100_000_000
+
+WEIGHTS = range(2, 7)
+
+
+def syndromes(width: int, poly: int, n: int) -> np.ndarray:
+    """
+    x^i mod G for every bit position i < n of a codeword, G = x^width + poly.
+    A set of bit errors goes undetected exactly when its syndromes XOR to 0.
+    """
+    if not 1 <= width <= 64:
+        raise ValueError(f"Width must be 1..64, got {width}")
+    if not poly & 1:
+        raise ValueError(f"Generator {poly:#x} has no x^0 term; x divides it and it misses bursts at the frame end")
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    values = np.empty(n, dtype=np.uint64)
+    reg = 1
+    for i in range(n):
+        values[i] = reg
+        reg = ((reg << 1) & mask) ^ poly if reg & top else reg << 1
+    return values
+
+
+def krawtchouk(k: int, j: int, n: int) -> int:
+    """K_k(j) for length n: the MacWilliams weight of a dual codeword of weight j in weight k."""
+    return sum((-1) ** l * math.comb(j, l) * math.comb(n - j, k - l) for l in range(k + 1))
+
+
+def _walsh_hadamard(values: np.ndarray) -> np.ndarray:
+    """Unnormalized Walsh-Hadamard transform of a power-of-two length array, in place."""
+    h = 1
+    while h < len(values):
+        pairs = values.reshape(-1, 2, h)
+        low = pairs[:, 0, :].copy()
+        pairs[:, 0, :] += pairs[:, 1, :]
+        pairs[:, 1, :] = low - pairs[:, 1, :]
+        h *= 2
+    return values
+
+
+def dual_counts(values: np.ndarray, width: int, weights) -> dict[int, int]:
+    """
+    Exact undetectable pattern counts from the weight distribution of the dual code.
+
+    The dual codeword for y has a 1 at every position whose syndrome has odd
+    parity with y, so its weight is (n - F(y)) / 2 where F is the Walsh-Hadamard
+    transform of the syndrome histogram. MacWilliams then gives the CRC
+    code's own weight distribution: A_k = 2^-width * sum_j B_j K_k(j).
+    """
+    n = len(values)
+    histogram = np.bincount(values.astype(np.intp), minlength=1 << width).astype(np.int32 if n < 1 << 31 else np.int64)
+    dual_weights = (n - _walsh_hadamard(histogram)) // 2
+    spectrum = np.bincount(dual_weights, minlength=n + 1)
+    present = [(j, int(spectrum[j])) for j in np.flatnonzero(spectrum)]
+    return {k: sum(count * krawtchouk(k, j, n) for j, count in present) >> width for k in weights}
+
+
+def _period(values: np.ndarray):
+    """Smallest T > 0 with x^T = 1 mod G within the frame, or None if the syndromes never repeat."""
+    repeats = np.flatnonzero(values[1:] == 1)
+    return int(repeats[0]) + 1 if len(repeats) else None
+
+
+# Fibonacci hashing multiplier for the syndrome table
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class SyndromeTable:
+    """
+    Open-addressing hash table from syndrome to bit position, probed for a
+    whole NumPy array of syndromes at once. Kept at most 1/8 full, so most
+    lookups settle on the first probe.
+    """
+
+    def __init__(self, values: np.ndarray):
+        bits = max(int(8 * len(values) - 1).bit_length(), 1)
+        self.mask = (1 << bits) - 1
+        self.shift = np.uint64(64 - bits)
+        self.keys = np.zeros(1 << bits, dtype=np.uint64)
+        self.positions = np.full(1 << bits, -1, dtype=np.int64)
+        for position, value in enumerate(values.tolist()):
+            slot = (value * HASH_MULTIPLIER & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+            while self.positions[slot] >= 0:
+                slot = (slot + 1) & self.mask
+            self.keys[slot] = value
+            self.positions[slot] = position
+
+    def find(self, queries: np.ndarray) -> np.ndarray:
+        """Position of each query syndrome, -1 where it is not in the table."""
+        found = np.full(len(queries), -1, dtype=np.int64)
+        slots = ((queries * np.uint64(HASH_MULTIPLIER)) >> self.shift).astype(np.intp)
+        pending = np.arange(len(queries))
+        while len(pending):
+            positions = self.positions[slots]
+            hit = (self.keys[slots] == queries) & (positions >= 0)
+            found[pending[hit]] = positions[hit]
+            # Occupied by another syndrome: try the next slot
+            collided = ~hit & (positions >= 0)
+            pending, slots, queries = pending[collided], (slots[collided] + 1) & self.mask, queries[collided]
+        return found
+
+
+def _placements(q, last, n, table, period):
+    """
+    Sum over every D > last with syndrome q of (n - D): the anchored pattern
+    closes at D, and a pattern spanning D bits fits n - D positions.
+    """
+    base = table.find(q)
+    if period is None:
+        return int((n - base[base > last]).sum())
+    # Positions with this syndrome are base, base + T, base + 2T, ...
+    first = np.maximum(0, (last - base) // period + 1)
+    final = (n - 1 - base) // period
+    count = np.where(base >= 0, np.maximum(final - first + 1, 0), 0)
+    return int((count * (n - base) - period * count * (first + final) // 2).sum())
+
+
+def anchored_counts(values: np.ndarray, weights, max_lookups: int = MAX_LOOKUPS) -> dict[int, int | None]:
+    """
+    Undetectable pattern counts by syndrome lookup.
+
+    Multiplying by x shifts a pattern without changing whether its syndrome
+    is 0, so every pattern is a shifted copy of one starting at bit 0. For
+    weight k, the k - 2 inner positions are enumerated (the last one or two as
+    NumPy vectors) and the closing position is found in a syndrome
+    hash table: O(n^(k-2)) lookups instead of O(n^k) for brute force. Weights
+    needing more than max_lookups lookups come back as None.
+    """
+    n = len(values)
+    period = _period(values)
+    table = SyndromeTable(values[:period] if period else values)
+    positions = np.arange(n, dtype=np.int64)
+    one = np.uint64(1)
+    counts = {}
+    for k in weights:
+        if k == 2:
+            closing = np.arange(period, n, period) if period else np.empty(0, dtype=np.int64)
+            counts[k] = int((n - closing).sum())
+            continue
+        if math.comb(n - 2, k - 2) > max_lookups:
+            counts[k] = None
+            continue
+        total = 0
+        vector = 1 if k <= 4 else 2  # Inner positions handled as one NumPy batch
+        if vector == 2:
+            first, second = np.triu_indices(n - 1, 1)
+            keep = first > 0
+            first, second = first[keep], second[keep]
+            pair_sums = values[first] ^ values[second]
+        for prefix in combinations(range(1, n), k - 2 - vector):
+            start = prefix[-1] + 1 if prefix else 1
+            partial = one
+            for position in prefix:
+                partial ^= values[position]
+            if vector == 1:
+                total += _placements(partial ^ values[start:n - 1], positions[start:n - 1], n, table, period)
+            else:
+                tail = np.searchsorted(first, start)
+                total += _placements(partial ^ pair_sums[tail:], second[tail:], n, table, period)
+        counts[k] = total
+    return counts
+
+
+def analyze(width: int, poly: int, message_bits: int, weights=WEIGHTS, max_lookups: int = MAX_LOOKUPS) -> dict:
+    """
+    Error detection strength of generator x^width + poly on frames of
+    message_bits data bits plus the CRC (errors may hit either).
+
+    Returns:
+        dict with the codeword length, undetectable pattern count per weight
+        (None if not counted), the Hamming distance (first weight with any
+        undetectable pattern) and whether it is exact or only a lower bound
+    """
+    if message_bits < 1:
+        raise ValueError("A frame needs at least one message bit")
+    n = message_bits + width
+    values = syndromes(width, poly, n)
+    if width <= DUAL_MAX_WIDTH:
+        counts = dual_counts(values, width, weights)
+    else:
+        counts = anchored_counts(values, weights, max_lookups)
+    hd, exact = max(weights) + 1, False
+    for k in sorted(counts):
+        if counts[k] is None:
+            hd = k
+            break
+        if counts[k]:
+            hd, exact = k, True
+            break
+    return {'width': width, 'poly': poly, 'bits': n, 'counts': counts, 'hd': hd, 'hd_exact': exact}
+
+
+def rank(candidates, message_bits: int, weights=WEIGHTS, max_lookups: int = MAX_LOOKUPS) -> list[dict]:
+    """
+    Analyze (width, poly) candidates and order them best first: highest
+    Hamming distance, then fewest undetectable patterns at the lowest weight,
+    and so on up the weights. Comparison stops at the first weight a
+    candidate left uncounted, so one with no patterns found so far ranks
+    ahead of one with patterns at that weight.
+    """
+    results = [analyze(width, poly, message_bits, weights, max_lookups) for width, poly in candidates]
+
+    def key(result):
+        known = []
+        for k in sorted(result['counts']):
+            if result['counts'][k] is None:
+                break
+            known.append(result['counts'][k])
+        return known
+
+    return sorted(results, key=key)
+
+
+def format_count(count) -> str:
+    """Table cell for a pattern count: '?' if not counted, scientific once it outgrows the column."""
+    if count is None:
+        return '?'
+    return str(count) if count < 10 ** 12 else f"{count:.4e}"
+
+
+def parse_candidate(text: str, width):
+    """'CRC-32' (a preset name) or a generator without its x^width term, e.g. '0x1021' (needs --width)."""
+    if text in CRC_PRESETS:
+        return CRC_PRESETS[text].width, CRC_PRESETS[text].poly
+    if width is None:
+        raise ValueError(f"{text!r} is not a preset name; give --width for raw generators")
+    poly = int(text, 0)
+    if poly >> width:
+        raise ValueError(f"Generator {text} does not fit {width} bits (leave out the x^{width} term)")
+    return width, poly
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank CRC generator polynomials by error detection strength")
+    parser.add_argument('candidates', nargs='*',
+                        help=f"Preset names ({', '.join(CRC_PRESETS)}) or generators without the x^width term")
+    parser.add_argument('--bits', type=int, required=True, help="Message bits per frame (the CRC is added on top)")
+    parser.add_argument('--width', type=int, default=None, help="CRC width for raw generators and --random")
+    parser.add_argument('--random', type=int, default=0, help="Also rank this many random generators of --width")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-lookups', type=int, default=MAX_LOOKUPS,
+                        help=f"Enumeration budget per weight for generators wider than {DUAL_MAX_WIDTH} bits")
+    args = parser.parse_args()
+    try:
+        candidates = [parse_candidate(text, args.width) for text in args.candidates]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.random:
+        if args.width is None:
+            parser.error("--random needs --width")
+        rng = random.Random(args.seed)
+        candidates += [(args.width, rng.getrandbits(args.width) | 1) for _ in range(args.random)]
+    if not candidates:
+        parser.error("Give candidate generators or --random")
+
+    start = time.perf_counter()
+    try:
+        results = rank(candidates, args.bits, max_lookups=args.max_lookups)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    names = {(preset.width, preset.poly): name for name, preset in CRC_PRESETS.items()}
+    print(f"{args.bits} message bits per frame, undetectable error patterns by weight ({elapsed:.2f}s)")
+    print(f"{'generator':<22}{'width':>6}{'HD':>5}" + ''.join(f"{f'w={k}':>14}" for k in WEIGHTS))
+    for result in results:
+        label = names.get((result['width'], result['poly']), f"{result['poly']:#x}")
+        hd = str(result['hd']) if result['hd_exact'] else f">={result['hd']}"
+        cells = ''.join(f"{format_count(count):>14}" for count in result['counts'].values())
+        print(f"{label:<22}{result['width']:>6}{hd:>5}{cells}")
+
+if __name__ == "__main__":
+    main()
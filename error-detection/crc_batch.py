@@ -0,0 +1,119 @@
+import numpy as np
+from CRC import CRC_PRESETS, REFLECT_BYTE, CRCPreset, fast_path, crc_table
+
+# REFLECT_BYTE as a lookup array
+REFLECT = np.frombuffer(REFLECT_BYTE, dtype=np.uint8)
+
+
+def _engine(width: int, poly: int):
+    """(table, register width, mask) for the uint64 batch engine."""
+    if not 1 <= width <= 64:
+        raise ValueError(f"Batch CRC holds registers in uint64, width must be 1..64, got {width}")
+    shift = max(width, 8)
+    table = np.array(crc_table(width, poly), dtype=np.uint64)
+    return table, shift, np.uint64((1 << shift) - 1)
+
+
+def crc_frames(frames, width: int, poly: int, crc=0) -> np.ndarray:
+    """
+    CRCs of equal-length frames, the rows of a 2-D uint8 array, MSB first
+    (same result as crc_bytes per row). The frame bytes are walked column by
+    column and every table lookup covers all frames at once.
+    `crc` is the starting register: a scalar or one value per frame.
+
+    Returns:
+        uint64 array of remainders, one per frame
+    """
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of frames, got {frames.ndim} dimensions")
+    table, shift, mask = _engine(width, poly)
+    align = np.uint64(shift - width)
+    down = np.uint64(shift - 8)
+    eight = np.uint64(8)
+    reg = np.broadcast_to(np.asarray(crc, dtype=np.uint64), (len(frames),)) << align
+    # One contiguous row per byte position
+    for column in np.ascontiguousarray(frames.T):
+        reg = ((reg << eight) & mask) ^ table[(reg >> down) ^ column]
+    return reg >> align
+
+
+def _frame_lengths(offsets, size: int) -> np.ndarray:
+    """Frame lengths for packed offsets, checked against a buffer of `size` bytes."""
+    lengths = np.diff(offsets)
+    if len(offsets) and (lengths.min(initial=0) < 0 or offsets[0] < 0 or offsets[-1] > size):
+        raise ValueError("Offsets must be non-decreasing and within the buffer")
+    return lengths
+
+
+def crc_packed(buffer, offsets, width: int, poly: int, crc: int = 0) -> np.ndarray:
+    """
+    CRCs of variable-length frames stored back to back in one buffer.
+    Frame i is buffer[offsets[i]:offsets[i + 1]], so offsets holds one more
+    entry than there are frames. Frames are walked longest first, so at every
+    byte position the frames still running are a prefix of the batch and no
+    padding is needed.
+
+    Returns:
+        uint64 array of remainders, one per frame, in the order of offsets
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    lengths = _frame_lengths(offsets, len(data))
+    table, shift, mask = _engine(width, poly)
+    align = np.uint64(shift - width)
+    down = np.uint64(shift - 8)
+    eight = np.uint64(8)
+
+    order = np.argsort(-lengths, kind='stable')
+    starts = offsets[:-1][order]
+    # running[j] = frames longer than j bytes; they lead the sorted order
+    running = np.searchsorted(-lengths[order], -np.arange(lengths.max(initial=0)), side='left')
+    reg = np.full(len(order), np.uint64(crc) << align, dtype=np.uint64)
+    for position, count in enumerate(running):
+        active = reg[:count]
+        reg[:count] = ((active << eight) & mask) ^ table[(active >> down) ^ data[starts[:count] + position]]
+    result = np.empty_like(reg)
+    result[order] = reg >> align
+    return result
+
+
+def reflect_array(values: np.ndarray, width: int) -> np.ndarray:
+    """Reverse the low `width` bits of every uint64 in values."""
+    octets = REFLECT[values.astype('<u8').view(np.uint8).reshape(-1, 8)[:, ::-1]]
+    return np.ascontiguousarray(octets).view('<u8').ravel().astype(np.uint64) >> np.uint64(64 - width)
+
+
+def _finish(reg: np.ndarray, preset: CRCPreset) -> np.ndarray:
+    if preset.refout:
+        reg = reflect_array(reg, preset.width)
+    return reg ^ np.uint64(preset.xorout)
+
+
+def preset_frames(frames, preset: str | CRCPreset) -> np.ndarray:
+    """crc_frames under a preset (see CRC_PRESETS): init, reflection and final XOR applied."""
+    if isinstance(preset, str):
+        preset = CRC_PRESETS[preset]
+    frames = np.ascontiguousarray(frames, dtype=np.uint8)
+    fast = fast_path(preset)
+    if fast:  # A C loop over the frames beats the vectorized tables
+        return np.fromiter((fast(row) for row in frames), dtype=np.uint64, count=len(frames))
+    if preset.refin:
+        frames = REFLECT[frames]
+    return _finish(crc_frames(frames, preset.width, preset.poly, preset.init), preset)
+
+
+def preset_packed(buffer, offsets, preset: str | CRCPreset) -> np.ndarray:
+    """crc_packed under a preset (see CRC_PRESETS): init, reflection and final XOR applied."""
+    if isinstance(preset, str):
+        preset = CRC_PRESETS[preset]
+    fast = fast_path(preset)
+    if fast:
+        view = memoryview(buffer).cast('B')
+        offsets = np.asarray(offsets, dtype=np.intp)
+        _frame_lengths(offsets, len(view))
+        return np.fromiter((fast(view[start:end]) for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())),
+                           dtype=np.uint64, count=len(offsets) - 1)
+    if preset.refin:
+        buffer = REFLECT[np.frombuffer(buffer, dtype=np.uint8)]
+    return _finish(crc_packed(buffer, offsets, preset.width, preset.poly, preset.init), preset)
@@ -2,11 +2,20 @@
 import socket
 import threading
 import logging
-from hamming_utils import HammingCode
+import framing
+from hamming_utils import DEFAULT_CODEC, HammingCode
 
 HOST = '127.0.0.1'
 PORT = 5000
 
+# Wire formats this client understands, preferred first (see server.py)
+WIRE_FORMATS = ('framed', 'packed', 'text')
+
+# Payload codecs this client understands, preferred first (see hamming_utils.CODECS).
+# 'seg63s4' corrects one error per (63,57) block and reports two in the same
+# block instead of miscorrecting them; the server transcodes for peers on 'whole'.
+CODECS = ('seg63s4', 'whole')
+
 hamming = HammingCode()
 
 logging.basicConfig(
@@ -17,61 +26,124 @@ logging.basicConfig(
     ]
 )
 
-def receive(sock: socket.socket, user_id: str) -> None:
+def negotiate_format(sock: socket.socket) -> tuple[str | None, str]:
+    """
+    Read the server's greeting up to the user ID prompt.
+    Returns the best wire format and payload codec both sides support. The
+    format is None if the server does not advertise any (older servers only
+    speak the text format); servers that list no codecs only know 'whole'.
+    """
+    greeting = b''
+    while b'Enter your user ID:' not in greeting:
+        data = sock.recv(1024)
+        if not data:
+            raise ConnectionError("Server closed the connection during the greeting.")
+        greeting += data
+    wire_format, codec = None, DEFAULT_CODEC
+    for line in greeting.decode('utf-8').splitlines():
+        if line.startswith('FORMATS:'):
+            offered = line[len('FORMATS:'):].split(',')
+            wire_format = next((f for f in WIRE_FORMATS if f in offered), None)
+        elif line.startswith('CODECS:'):
+            offered = line[len('CODECS:'):].split(',')
+            codec = next((c for c in CODECS if c in offered), DEFAULT_CODEC)
+    return wire_format, codec
+
+
+def show_message(original_msg: str, hamming_payload: str, codec: str, sender: str | None = None) -> None:
+    """Decode a received Hamming payload and display it."""
     try:
+        decoded_msg, error_info = hamming.decode_with(hamming_payload, codec)
+        
+        if not error_info['repairable']:
+            print("\n--- [TRANSMISSION ERROR] ---")
+            print("Non-repairable transmission error detected!")
+            if error_info.get('error_blocks'):
+                print(f"Uncorrectable blocks: {error_info['error_blocks']}")
+            print("Message corrupted and cannot be recovered. Ask the sender to resend.")
+            print("----------------------------")
+            return
+        
+        # Display the message
+        source = f" from {sender}" if sender else ""
+        if error_info['error_detected'] and error_info['error_corrected']:
+            print(f"\n--- [MESSAGE{source} (Error Corrected at bit {error_info['error_position']})] ---")
+            print(f"{decoded_msg}")
+            print("--------------------------------------------------")
+        else:
+            print(f"\n--- [MESSAGE{source}] ---")
+            print(f"{decoded_msg}")
+            print("-----------------")
+        
+        # Verify message integrity by comparing with original
+        if decoded_msg != original_msg:
+            print(f"[WARNING] Decoded message '{decoded_msg}' differs from original transmission '{original_msg}'!")
+        
+    except Exception as e:
+        print(f"\n[CLIENT] Error decoding message: {e}")
+    
+    # The input prompt is handled by the main loop's input()
+    # No need to print "You: " here explicitly after each message
+    # as it might interfere with user typing.
+    # A simple newline can help separate messages from the input prompt area visually.
+    print() # Adds a little space before the next potential prompt from main loop
+
+
+def receive_framed(sock: socket.socket, codec: str) -> None:
+    """Read length-prefixed frames until the server closes the connection."""
+    while True:
+        frame = framing.recv_frame(sock)
+        if frame is None:
+            print("\n[CLIENT] Connection closed by server.")
+            return
+        frame_type, fields = frame
+        if frame_type == framing.ERROR:
+            print(f"\n[SERVER ERROR] {bytes(fields.get(framing.TEXT, b'')).decode('utf-8')}")
+            continue
+        if frame_type != framing.MESSAGE or framing.PAYLOAD not in fields:
+            continue # Frame types from a newer server
+        try:
+            hamming_payload = hamming.unpack_bits(fields[framing.PAYLOAD])
+        except ValueError as e:
+            print(f"\n[CLIENT] Error decoding message: {e}")
+            continue
+        show_message(bytes(fields.get(framing.ORIGINAL, b'')).decode('utf-8'), hamming_payload, codec,
+                     bytes(fields.get(framing.SENDER, b'')).decode('utf-8') or None)
+
+
+def receive(sock: socket.socket, user_id: str, wire_format: str, codec: str) -> None:
+    try:
+        if wire_format == 'framed':
+            receive_framed(sock, codec)
+            return
         while True:
             raw_data = sock.recv(4096)
             if not raw_data:
                 print("\n[CLIENT] Connection closed by server.")
                 break
             
-            raw = raw_data.decode('utf-8')
-            
-            if raw.startswith("SERVER_ERROR|"):
-                error_content = raw.split("|", 1)[1]
+            if raw_data.startswith(b"SERVER_ERROR|"):
+                error_content = raw_data.decode('utf-8').split("|", 1)[1]
                 print(f"\n[SERVER ERROR] {error_content}")
                 # No longer re-printing prompt from here, main input loop handles it
                 continue
             
-            parts = raw.split('|', 1)
+            # Split on the raw bytes: a packed payload is not valid UTF-8
+            parts = raw_data.split(b'|', 1)
             if len(parts) != 2:
                 print("\n[CLIENT] Invalid message format received from server.")
                 continue
             
-            original_msg, hamming_payload = parts
-            
+            original_msg = parts[0].decode('utf-8')
             try:
-                decoded_msg, error_info = hamming.decode(hamming_payload)
-                
-                if not error_info['repairable']:
-                    print("\n--- [TRANSMISSION ERROR] ---")
-                    print("Non-repairable transmission error detected!")
-                    print("Message corrupted and cannot be recovered.")
-                    print("----------------------------")
-                    continue
-                
-                # Display the message
-                if error_info['error_detected'] and error_info['error_corrected']:
-                    print(f"\n--- [MESSAGE (Error Corrected at bit {error_info['error_position']})] ---")
-                    print(f"{decoded_msg}")
-                    print("--------------------------------------------------")
+                if wire_format == 'packed':
+                    hamming_payload = hamming.unpack_bits(parts[1])
                 else:
-                    print("\n--- [MESSAGE] ---")
-                    print(f"{decoded_msg}")
-                    print("-----------------")
-                
-                # Verify message integrity by comparing with original
-                if decoded_msg != original_msg:
-                    print(f"[WARNING] Decoded message '{decoded_msg}' differs from original transmission '{original_msg}'!")
-                
-            except Exception as e:
+                    hamming_payload = parts[1].decode('utf-8')
+            except ValueError as e:
                 print(f"\n[CLIENT] Error decoding message: {e}")
-            
-            # The input prompt is handled by the main loop's input()
-            # No need to print "You: " here explicitly after each message
-            # as it might interfere with user typing.
-            # A simple newline can help separate messages from the input prompt area visually.
-            print() # Adds a little space before the next potential prompt from main loop
+                continue
+            show_message(original_msg, hamming_payload, codec)
             
     except ConnectionResetError:
         print("\n[CLIENT] Connection lost to server.")
@@ -94,14 +166,18 @@ def start_client() -> None:
             print("Error detection and correction enabled.")
             print("----------------------")
             
-            server_prompt_data = s.recv(1024)
-            server_prompt = server_prompt_data.decode('utf-8').strip()
-            # print(f"[SERVER] {server_prompt}") # Optional: display server's prompt text
+            wire_format, codec = negotiate_format(s)
             
             user_id = input("Enter your user ID: ")
-            s.sendall(user_id.encode('utf-8'))
+            if wire_format:
+                # e.g. "FORMAT:framed;codec=seg63s4"; the default codec needs no parameter
+                codec_param = f";codec={codec}" if codec != DEFAULT_CODEC else ""
+                s.sendall(f"{user_id}\nFORMAT:{wire_format}{codec_param}".encode('utf-8'))
+            else:
+                s.sendall(user_id.encode('utf-8'))
+                wire_format, codec = 'text', DEFAULT_CODEC
             
-            threading.Thread(target=receive, args=(s, user_id), daemon=True).start()
+            threading.Thread(target=receive, args=(s, user_id, wire_format, codec), daemon=True).start()
             
             print("\n--- [INSTRUCTIONS] ---")
             print("Usage: recipient_id/Your message here")
@@ -128,10 +204,21 @@ def start_client() -> None:
                         continue
                     
                     try:
-                        hamming_encoded = hamming.encode(message)
-                        payload = f"{recipient.strip()}|{message}|{hamming_encoded}"
-                        s.sendall(payload.encode('utf-8'))
-                        print(f"Message sent to {recipient} ({len(hamming_encoded)} bits encoded).")
+                        hamming_encoded = hamming.encode_with(message, codec)
+                        if wire_format == 'framed':
+                            framing.send_frame(s, framing.MESSAGE, [
+                                (framing.RECIPIENT, recipient.strip().encode('utf-8')),
+                                (framing.ORIGINAL, message.encode('utf-8')),
+                                (framing.PAYLOAD, hamming.pack_bits(hamming_encoded)),
+                            ])
+                        else:
+                            header = f"{recipient.strip()}|{message}|"
+                            if wire_format == 'packed':
+                                payload = header.encode('utf-8') + hamming.pack_bits(hamming_encoded)
+                            else:
+                                payload = (header + hamming_encoded).encode('utf-8')
+                            s.sendall(payload)
+                        print(f"Message sent to {recipient} ({len(hamming_encoded)} bits encoded, {wire_format} format, {codec} codec).")
                     except Exception as e:
                         print(f"Encoding error: {e}")
                 
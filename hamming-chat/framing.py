@@ -0,0 +1,94 @@
+# framing.py
+import socket
+import struct
+
+# Frame: type (1 byte) and body length (4 bytes, big-endian), then the body.
+# The body is a sequence of typed fields, each a type byte, a 4-byte length
+# and the value. Receivers skip field types they do not know.
+FRAME_HEADER = struct.Struct('!BI')
+FIELD_HEADER = struct.Struct('!BI')
+MAX_FRAME = 16 * 1024 * 1024
+
+# Frame types
+MESSAGE = 1
+ERROR = 2
+
+# Field types
+RECIPIENT = 1   # UTF-8 user ID, client -> server
+SENDER = 2      # UTF-8 user ID, server -> client
+ORIGINAL = 3    # UTF-8 original message text
+PAYLOAD = 4     # Hamming bits, packed with a bit-length header (HammingCode.pack_bits)
+TEXT = 5        # UTF-8 error text
+
+
+def recv_exact(sock: socket.socket, size: int):
+    """Read exactly size bytes; returns None if the peer closes first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return buffer
+
+
+def parse_fields(body):
+    """Split a frame body into {field_type: memoryview}; raises ValueError if it is malformed."""
+    view = memoryview(body)
+    fields = {}
+    offset = 0
+    while offset < len(view):
+        if len(view) - offset < FIELD_HEADER.size:
+            raise ValueError("Truncated field header.")
+        field_type, length = FIELD_HEADER.unpack_from(view, offset)
+        offset += FIELD_HEADER.size
+        if length > len(view) - offset:
+            raise ValueError(f"Field {field_type} claims {length} bytes, {len(view) - offset} left.")
+        fields[field_type] = view[offset:offset + length]
+        offset += length
+    return fields
+
+
+def recv_frame(sock: socket.socket):
+    """
+    Read one frame.
+    Returns (frame_type, fields) or None if the peer closed the connection;
+    raises ValueError for an oversized or malformed frame.
+    """
+    header = recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    frame_type, length = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit.")
+    body = recv_exact(sock, length)
+    if body is None:
+        return None
+    return frame_type, parse_fields(body)
+
+
+def frame_buffers(frame_type, fields):
+    """Header and field buffers for one frame, for scatter-gather sends; fields is a list of (type, bytes-like)."""
+    buffers = [None]
+    length = 0
+    for field_type, value in fields:
+        buffers.append(FIELD_HEADER.pack(field_type, len(value)))
+        buffers.append(value)
+        length += FIELD_HEADER.size + len(value)
+    buffers[0] = FRAME_HEADER.pack(frame_type, length)
+    return buffers
+
+
+def send_frame(sock: socket.socket, frame_type, fields):
+    """Send one frame with sendmsg, without joining the field values into one buffer."""
+    buffers = [memoryview(buffer).cast('B') for buffer in frame_buffers(frame_type, fields)]
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        # Drop what went out; a partial write leaves the rest of one buffer
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if buffers and sent:
+            buffers[0] = buffers[0][sent:]
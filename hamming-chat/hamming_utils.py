@@ -1,6 +1,120 @@
 # hamming_utils_corrected.py
 import math
 import logging
+import struct
+from functools import partial
+from itertools import zip_longest
+
+# Packed wire format: bit length as a 4-byte big-endian header, then the bits
+# MSB-first, zero-padded to a whole byte
+BIT_LENGTH_HEADER = struct.Struct('!I')
+
+# Segmented mode: the message is cut into independent (n, k) codewords,
+# n = 2^r - 1, e.g. (63,57) or (255,247); the last block is shortened
+DEFAULT_BLOCK_LENGTH = 63
+
+# Payload codecs, negotiated per client next to the wire format. 'whole' is one
+# codeword over the whole message, what clients that do not negotiate use;
+# 'seg63s4' is (63,57) SECDED blocks interleaved 4 deep (see encode_segmented).
+CODECS = {
+    'seg63s4': {'block_length': 63, 'secded': True, 'depth': 4},
+    'whole': None,
+}
+DEFAULT_CODEC = 'whole'
+
+
+def block_data_length(block_length):
+    """Data bits k of an (n, k) Hamming block; n must be 2^r - 1 with r >= 2."""
+    if block_length < 3 or block_length & (block_length + 1):
+        raise ValueError(f"Block length must be 2^r - 1 (3, 7, 15, 31, 63, 127, 255, ...), got {block_length}.")
+    return block_length - block_length.bit_length()
+
+
+def encode_block(data_bits, secded=False):
+    """
+    Encode one block of '0'/'1' data bits into a Hamming codeword in one pass.
+    Data goes to the non-power-of-2 positions; the parity bit at position 2^i
+    is bit i of the XOR of the positions that hold a 1.
+    With secded=True an overall parity bit is appended (extended Hamming),
+    so double errors are detected instead of miscorrected.
+    """
+    codeword = []
+    syndrome = 0
+    position = 1
+    for bit in data_bits:
+        while not position & (position - 1): # Power of 2: reserve for parity
+            codeword.append('0')
+            position += 1
+        codeword.append(bit)
+        if bit == '1':
+            syndrome ^= position
+        position += 1
+    parity = 1
+    while parity <= len(codeword):
+        if syndrome & parity:
+            codeword[parity - 1] = '1'
+        parity <<= 1
+    if secded:
+        codeword.append('1' if codeword.count('1') % 2 else '0')
+    return ''.join(codeword)
+
+
+def decode_block(codeword, secded=False):
+    """
+    Correct and strip one Hamming codeword produced by encode_block.
+    The syndrome is the XOR of the positions that hold a 1; a nonzero
+    syndrome is the position of a single flipped bit.
+    Returns (data_bits, syndrome), data_bits is None if the block cannot be
+    repaired: the syndrome points past its end or, with secded=True, the
+    overall parity shows an even number of flips.
+    """
+    if secded:
+        overall_parity_error = codeword.count('1') % 2
+        data_bits, syndrome = decode_block(codeword[:-1])
+        if not overall_parity_error:
+            # Zero or two flips; a nonzero syndrome here means two
+            return (None, syndrome) if syndrome else (data_bits, 0)
+        # Odd flips with a zero syndrome: only the overall parity bit flipped
+        return data_bits, syndrome or len(codeword)
+    syndrome = 0
+    for position, bit in enumerate(codeword, 1):
+        if bit == '1':
+            syndrome ^= position
+    if syndrome > len(codeword):
+        return None, syndrome
+    if syndrome:
+        flipped = '0' if codeword[syndrome - 1] == '1' else '1'
+        codeword = codeword[:syndrome - 1] + flipped + codeword[syndrome:]
+    data_bits = [bit for position, bit in enumerate(codeword, 1) if position & (position - 1)]
+    return ''.join(data_bits), syndrome
+
+
+def interleave_blocks(blocks, depth):
+    """
+    Block interleaver: every `depth` consecutive codewords are sent column by
+    column (bit 1 of each, then bit 2 of each, ...), so a burst of up to
+    `depth` bits hits `depth` different codewords. A shorter codeword simply
+    drops out of the columns past its end.
+    """
+    groups = (blocks[i:i + depth] for i in range(0, len(blocks), depth))
+    return ''.join(''.join(column) for group in groups
+                   for column in zip_longest(*group, fillvalue=''))
+
+
+def deinterleave_blocks(bits, block_lengths, depth):
+    """Inverse of interleave_blocks, given the length of every codeword."""
+    blocks = []
+    offset = 0
+    for i in range(0, len(block_lengths), depth):
+        lengths = block_lengths[i:i + depth]
+        rows = [[] for _ in lengths]
+        for column in range(max(lengths)):
+            for row, length in zip(rows, lengths):
+                if column < length:
+                    row.append(bits[offset])
+                    offset += 1
+        blocks.extend(''.join(row) for row in rows)
+    return blocks
 
 class HammingCode:
     """
@@ -268,6 +382,128 @@ class HammingCode:
             self.logger.info("Decoding process finished.")
             self.logger.info("=" * 60)
 
+    def encode_segmented(self, message, block_length=DEFAULT_BLOCK_LENGTH, executor=None,
+                         secded=False, depth=1):
+        """
+        Encode a string message as a sequence of independent (n, k) Hamming blocks.
+        Each block corrects one bit error of its own, and costs O(n) to encode.
+        secded=True adds an overall parity bit per block (n+1 bits) to detect
+        double errors; depth > 1 interleaves every `depth` blocks bit by bit.
+        Pass a concurrent.futures executor to encode the blocks in parallel.
+        Returns the concatenated codewords as a binary string.
+        """
+        k = block_data_length(block_length)
+        data_binary = self._string_to_binary(message)
+        blocks = [data_binary[i:i + k] for i in range(0, len(data_binary), k)]
+        mapper = executor.map if executor else map
+        codewords = list(mapper(partial(encode_block, secded=secded), blocks))
+        encoded = interleave_blocks(codewords, depth) if depth > 1 else ''.join(codewords)
+        self.logger.info(f"Segmented encoding: {len(data_binary)} data bits -> {len(blocks)} "
+                         f"({block_length},{k}) blocks{' SECDED' if secded else ''}, "
+                         f"interleave depth {depth}, {len(encoded)} bits")
+        return encoded
+
+    def decode_segmented(self, received_encoded_data, block_length=DEFAULT_BLOCK_LENGTH, executor=None,
+                         secded=False, depth=1):
+        """
+        Decode the output of encode_segmented, correcting up to one bit error per block.
+        secded and depth must match the encoder. With secded=True a block with two
+        errors is reported in error_blocks instead of being miscorrected.
+        Pass a concurrent.futures executor to decode the blocks in parallel.
+        Returns (decoded_message, error_info) like decode(); error_position is the
+        list of corrected positions (1-indexed within each block's codeword, counted
+        as if the blocks were sent back to back) and error_blocks the indices of
+        blocks that could not be repaired.
+        """
+        k = block_data_length(block_length)
+        received_encoded_data = received_encoded_data.strip()
+        codeword_length = block_length + 1 if secded else block_length
+        total_length = len(received_encoded_data)
+        block_lengths = [codeword_length] * (total_length // codeword_length)
+        if total_length % codeword_length:
+            block_lengths.append(total_length % codeword_length)
+        if depth > 1:
+            blocks = deinterleave_blocks(received_encoded_data, block_lengths, depth)
+        else:
+            blocks = [received_encoded_data[i:i + codeword_length]
+                      for i in range(0, total_length, codeword_length)]
+        error_info = {
+            'syndrome': [], 'error_detected': False, 'error_corrected': False,
+            'error_position': [], 'error_blocks': [], 'repairable': True, 'message': ""
+        }
+        
+        # Only the last block may be shortened, and only to a length encode_block produces
+        last_length = block_lengths[-1] - secded if blocks else 0
+        if blocks and last_length != block_length and not self._is_plausible_hamming_length(last_length):
+            error_info.update(error_detected=True, repairable=False,
+                              message=f"Invalid last block length {len(blocks[-1])} for ({block_length},{k}) blocks.")
+            self.logger.error(error_info['message'])
+            return None, error_info
+        
+        mapper = executor.map if executor else map
+        data_blocks = []
+        for index, (data_bits, syndrome) in enumerate(mapper(partial(decode_block, secded=secded), blocks)):
+            error_info['syndrome'].append(syndrome)
+            if data_bits is None:
+                error_info['error_blocks'].append(index)
+            elif syndrome:
+                error_info['error_position'].append(index * codeword_length + syndrome)
+            data_blocks.append(data_bits)
+        
+        error_info['error_detected'] = any(error_info['syndrome'])
+        error_info['error_corrected'] = bool(error_info['error_position'])
+        if error_info['error_blocks']:
+            error_info['repairable'] = False
+            error_info['message'] = f"Non-repairable errors in blocks {error_info['error_blocks']}."
+            self.logger.error(error_info['message'])
+            return None, error_info
+        
+        self.logger.info(f"Segmented decoding: {len(blocks)} ({block_length},{k}) blocks{' SECDED' if secded else ''}, "
+                         f"corrected positions {error_info['error_position']}")
+        try:
+            return self._binary_to_string(''.join(data_blocks)), error_info
+        except ValueError as e:
+            error_info['repairable'] = False
+            error_info['message'] = str(e)
+            return None, error_info
+
+    def encode_with(self, message, codec):
+        """Encode a string message with one of the named CODECS."""
+        options = CODECS[codec]
+        return self.encode_segmented(message, **options) if options else self.encode(message)
+
+    def decode_with(self, received_encoded_data, codec):
+        """Decode with one of the named CODECS; returns (decoded_message, error_info) like decode()."""
+        options = CODECS[codec]
+        if options:
+            return self.decode_segmented(received_encoded_data, **options)
+        return self.decode(received_encoded_data)
+
+    def pack_bits(self, bit_string):
+        """Pack a '0'/'1' string into bytes with a bit-length header (8 bits per byte)."""
+        n_bits = len(bit_string)
+        n_bytes = (n_bits + 7) // 8
+        value = int(bit_string, 2) << (n_bytes * 8 - n_bits) if n_bits else 0
+        return BIT_LENGTH_HEADER.pack(n_bits) + value.to_bytes(n_bytes, 'big')
+
+    def packed_bit_length(self, packed):
+        """Validate a packed payload's header against its size; returns the bit length."""
+        if len(packed) < BIT_LENGTH_HEADER.size:
+            raise ValueError(f"Packed payload of {len(packed)} bytes is shorter than its header.")
+        (n_bits,) = BIT_LENGTH_HEADER.unpack_from(packed)
+        if len(packed) - BIT_LENGTH_HEADER.size != (n_bits + 7) // 8:
+            raise ValueError(f"Packed payload holds {len(packed) - BIT_LENGTH_HEADER.size} bytes, header says {n_bits} bits.")
+        return n_bits
+
+    def unpack_bits(self, packed):
+        """Inverse of pack_bits: returns the '0'/'1' string."""
+        n_bits = self.packed_bit_length(packed)
+        if not n_bits:
+            return ""
+        n_bytes = (n_bits + 7) // 8
+        value = int.from_bytes(packed[BIT_LENGTH_HEADER.size:], 'big') >> (n_bytes * 8 - n_bits)
+        return format(value, f'0{n_bits}b')
+
     def _calculate_min_parity_bits(self, total_length):
         """Calculate how many parity bits r are present in a code of total_length n. (number of powers of 2 <= n)"""
         if total_length < 1:
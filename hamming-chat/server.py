@@ -3,6 +3,8 @@ import socket
 import threading
 import random
 import logging # Using standard logging for server output
+import framing
+from hamming_utils import BIT_LENGTH_HEADER, CODECS, DEFAULT_CODEC, HammingCode
 
 
 HOST = '0.0.0.0'
@@ -11,21 +13,38 @@ PORT = 5000
 SINGLE_BIT_ERROR_PROBABILITY = 0.5
 DOUBLE_BIT_ERROR_PROBABILITY = 0.3
 
-clients = {}
+# Wire formats, preferred first. 'framed' sends length-prefixed frames with
+# typed fields (see framing.py) and a packed payload; 'packed' and 'text' send
+# one recipient|original|payload message per read, the payload carrying 8 bits
+# per byte behind a bit-length header or one '0'/'1' character per bit.
+# Clients that do not negotiate get 'text'. The payload codec (hamming_utils.CODECS)
+# is negotiated alongside, as in "FORMAT:framed;codec=seg63s4", and defaults to 'whole'.
+WIRE_FORMATS = ('framed', 'packed', 'text')
+
+clients = {} # user_id -> ClientHandler
 lock = threading.Lock()
 
 # Configure basic logging for the server
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [SERVER] - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+hamming = HammingCode()
+
 class ClientHandler(threading.Thread):
     def __init__(self, conn: socket.socket, addr):
         super().__init__(daemon=True)
         self.conn = conn
         self.addr = addr
         self.user_id = None
+        self.wire_format = 'text'
+        self.codec = DEFAULT_CODEC
+        # Several sender threads write to this client; frames must not interleave
+        self.send_lock = threading.Lock()
 
     def introduce_bit_errors(self, hamming_data):
+        """Flip random bits of a text ('0'/'1' str) or packed (bytes-like) payload."""
+        if not isinstance(hamming_data, str):
+            return self.introduce_packed_bit_errors(hamming_data)
         if not hamming_data: # Check for empty string
             return hamming_data, {'errors_introduced': False, 'error_type': None, 'positions': []}
         
@@ -65,81 +84,225 @@ class ClientHandler(threading.Thread):
         
         return ''.join(data_list), error_info
 
+    def introduce_packed_bit_errors(self, packed):
+        """Same error model as introduce_bit_errors, flipping bits in place in the packed bytes."""
+        n_bits = hamming.packed_bit_length(packed)
+        error_info = {'errors_introduced': False, 'error_type': None, 'positions': []}
+        
+        rand_val = random.random()
+        if rand_val < DOUBLE_BIT_ERROR_PROBABILITY and n_bits >= 2:
+            positions_0_indexed = random.sample(range(n_bits), 2)
+            error_info = {'errors_introduced': True, 'error_type': 'double', 'positions': []}
+        elif rand_val < (DOUBLE_BIT_ERROR_PROBABILITY + SINGLE_BIT_ERROR_PROBABILITY) and n_bits > 0:
+            positions_0_indexed = [random.randint(0, n_bits - 1)]
+            error_info = {'errors_introduced': True, 'error_type': 'single', 'positions': []}
+        else:
+            return packed, error_info
+        
+        data = bytearray(packed)
+        for pos_0_indexed in positions_0_indexed:
+            data[BIT_LENGTH_HEADER.size + pos_0_indexed // 8] ^= 0x80 >> (pos_0_indexed % 8)
+        error_info['positions'] = [p + 1 for p in positions_0_indexed] # 1-indexed
+        return bytes(data), error_info
+
+    def convert_payload(self, hamming_payload, wire_format):
+        """Re-encode a payload for a recipient that negotiated a different wire format."""
+        if wire_format != 'text':
+            return hamming.pack_bits(hamming_payload) if isinstance(hamming_payload, str) else hamming_payload
+        return hamming_payload if isinstance(hamming_payload, str) else hamming.unpack_bits(hamming_payload)
+
+    def transcode_payload(self, hamming_payload, codec):
+        """
+        Re-encode a payload for a recipient that negotiated a different codec.
+        It has not been through the simulated channel yet, so it decodes cleanly
+        unless the sender is broken. Returns a text payload, or None.
+        """
+        bits = hamming_payload if isinstance(hamming_payload, str) else hamming.unpack_bits(hamming_payload)
+        message, _ = hamming.decode_with(bits, self.codec)
+        return None if message is None else hamming.encode_with(message, codec)
+
+    def send(self, data):
+        with self.send_lock:
+            self.conn.sendall(data)
+
+    def send_error(self, text):
+        """Report a problem to this client in its own wire format."""
+        with self.send_lock:
+            if self.wire_format == 'framed':
+                framing.send_frame(self.conn, framing.ERROR, [(framing.TEXT, text.encode('utf-8'))])
+            else:
+                self.conn.sendall(f"SERVER_ERROR|{text}".encode('utf-8'))
+
+    def deliver(self, sender, original, hamming_payload):
+        """
+        Send a message from another client to this one.
+        `original` is the raw UTF-8 text as received and is passed through as is;
+        the payload is converted only if the sender used a different format.
+        """
+        hamming_payload = self.convert_payload(hamming_payload, self.wire_format)
+        if self.wire_format == 'framed':
+            with self.send_lock:
+                framing.send_frame(self.conn, framing.MESSAGE,
+                                   [(framing.SENDER, sender.encode('utf-8')), (framing.ORIGINAL, original),
+                                    (framing.PAYLOAD, hamming_payload)])
+        elif self.wire_format == 'packed':
+            self.send(b''.join([original, b'|', hamming_payload]))
+        else:
+            self.send(b''.join([original, b'|', hamming_payload.encode('utf-8')]))
+
+    def serve_framed(self):
+        """Read frames and route each one on its RECIPIENT field alone."""
+        while True:
+            try:
+                frame = framing.recv_frame(self.conn)
+            except ValueError as e: # Framing is lost; nothing after this can be trusted
+                logger.error(f"Bad frame from {self.user_id}: {e}")
+                self.send_error(f"Bad frame: {e}")
+                return
+            if frame is None:
+                return
+            frame_type, fields = frame
+            if frame_type != framing.MESSAGE or framing.RECIPIENT not in fields or framing.PAYLOAD not in fields:
+                logger.error(f"Unexpected frame type {frame_type} from {self.user_id}")
+                self.send_error("Expected a MESSAGE frame with RECIPIENT and PAYLOAD fields.")
+                continue
+            try:
+                recipient = bytes(fields[framing.RECIPIENT]).decode('utf-8')
+                hamming.packed_bit_length(fields[framing.PAYLOAD])
+            except UnicodeDecodeError:
+                logger.error(f"Unicode decode error in recipient from {self.user_id}")
+                continue
+            except ValueError as e:
+                logger.error(f"Malformed packed payload from {self.user_id}: {e}")
+                self.send_error(f"Malformed Hamming payload: {e}")
+                continue
+            original = fields.get(framing.ORIGINAL, b'')
+            logger.info(f"Forwarding from {self.user_id} → {recipient} ({len(original)} byte message, "
+                        f"{len(fields[framing.PAYLOAD])} byte payload)")
+            self.forward(recipient, original, fields[framing.PAYLOAD])
+
+    def serve_legacy(self):
+        """One recipient|original_message|hamming_payload message per read ('packed' and 'text' formats)."""
+        while True:
+            raw_data = self.conn.recv(4096)
+            if not raw_data:
+                return
+            
+            # Split on the raw bytes: a packed payload is not valid UTF-8
+            parts = raw_data.split(b'|', 2)
+            if len(parts) != 3:
+                logger.error(f"Invalid message format from {self.user_id}: {raw_data!r}")
+                self.send_error("Invalid message format. Use recipient|original_message|hamming_payload")
+                continue
+            
+            recipient, original, hamming_payload = parts
+            try:
+                recipient = recipient.decode('utf-8')
+                original_msg = original.decode('utf-8')
+                if self.wire_format == 'text':
+                    hamming_payload = hamming_payload.decode('utf-8')
+                else:
+                    hamming.packed_bit_length(hamming_payload)
+            except UnicodeDecodeError:
+                logger.error(f"Unicode decode error from {self.user_id}")
+                # Optionally notify client, but might be tricky if their side also has issues
+                continue
+            except ValueError as e:
+                logger.error(f"Malformed packed payload from {self.user_id}: {e}")
+                self.send_error(f"Malformed Hamming payload: {e}")
+                continue
+            
+            logger.info(f"Forwarding from {self.user_id} → {recipient} (Original: '{original_msg}')")
+            self.forward(recipient, original, hamming_payload)
+
+    def forward(self, recipient, original, hamming_payload):
+        """
+        Transcode the payload if the recipient uses another codec, corrupt it per
+        the error simulation settings and hand it to the recipient.
+        """
+        with lock:
+            target = clients.get(recipient)
+        
+        if not target:
+            logger.warning(f"❌ Recipient {recipient} not found or offline for message from {self.user_id}")
+            self.send_error(f"User '{recipient}' not found or offline.")
+            return
+        if target.codec != self.codec:
+            try:
+                hamming_payload = self.transcode_payload(hamming_payload, target.codec)
+            except ValueError:
+                hamming_payload = None
+            if hamming_payload is None:
+                logger.error(f"Cannot decode {self.codec} payload from {self.user_id} for {recipient}")
+                self.send_error(f"Hamming payload does not decode with the {self.codec} codec.")
+                return
+            logger.info(f"Transcoded message from {self.user_id} ({self.codec}) for {recipient} ({target.codec})")
+        
+        corrupted_hamming, error_info = self.introduce_bit_errors(hamming_payload)
+        
+        if error_info['errors_introduced']:
+            if error_info['error_type'] == 'single':
+                logger.warning(f"🔴 Introduced SINGLE bit error at position {error_info['positions'][0]} for message to {recipient}")
+            else: 
+                logger.warning(f"🔴🔴 Introduced DOUBLE bit errors at positions {error_info['positions']} for message to {recipient}")
+        else:
+            logger.info(f"✅ Clean transmission (no errors introduced) for message to {recipient}")
+
+        try:
+            target.deliver(self.user_id, original, corrupted_hamming)
+            logger.info(f"✉️ Message from {self.user_id} delivered to {recipient}")
+        except ValueError: # Text payload that is not a bit string
+            logger.error(f"Cannot pack payload from {self.user_id} for {recipient}")
+            self.send_error("Hamming payload must be a string of 0s and 1s.")
+        except socket.error as e:
+            logger.error(f"Socket error sending to {recipient}: {e}. Removing client.")
+            # Assume client disconnected, remove them
+            with lock:
+                clients.pop(recipient, None)
+            # Notify sender if possible, or just log
+            self.send_error(f"Failed to send message to '{recipient}', they might have disconnected.")
+
     def run(self) -> None:
         try:
-            prompt_msg = "Enter your user ID:\n" # Server asks client
+            # Advertise the wire formats ahead of the prompt; clients that predate
+            # negotiation ignore the extra line and keep using the text format
+            prompt_msg = (f"FORMATS:{','.join(WIRE_FORMATS)}\nCODECS:{','.join(CODECS)}\n"
+                          "Enter your user ID:\n") # Server asks client
             self.conn.sendall(prompt_msg.encode('utf-8'))
             
             user_id_data = self.conn.recv(1024)
             if not user_id_data: # Connection closed before sending user ID
                 logger.info(f"Connection from {self.addr} closed before user ID was sent.")
                 return
-            self.user_id = user_id_data.decode('utf-8').strip()
+            # "<user_id>" or "<user_id>\nFORMAT:<format>[;codec=<codec>]"
+            user_id_line, _, format_line = user_id_data.decode('utf-8').partition('\n')
+            self.user_id = user_id_line.strip()
+            requested_format, *params = format_line.strip().partition('FORMAT:')[2].split(';')
+            if requested_format in WIRE_FORMATS:
+                self.wire_format = requested_format
+            for param in params:
+                name, _, value = param.partition('=')
+                if name.strip() == 'codec' and value.strip() in CODECS:
+                    self.codec = value.strip()
 
             if not self.user_id: # Empty user ID
                 logger.warning(f"Client from {self.addr} provided an empty user ID. Closing connection.")
-                self.conn.sendall("SERVER_ERROR|User ID cannot be empty.".encode('utf-8'))
+                self.send_error("User ID cannot be empty.")
                 return
 
             with lock:
                 if self.user_id in clients:
                     logger.warning(f"User ID '{self.user_id}' already connected. Closing new connection from {self.addr}.")
-                    self.conn.sendall(f"SERVER_ERROR|User ID '{self.user_id}' is already in use.".encode('utf-8'))
+                    self.send_error(f"User ID '{self.user_id}' is already in use.")
                     return # Important to return here, otherwise it proceeds
-                clients[self.user_id] = self.conn
+                clients[self.user_id] = self
             
-            logger.info(f"{self.user_id} connected from {self.addr}")
+            logger.info(f"{self.user_id} connected from {self.addr} ({self.wire_format} format, {self.codec} codec)")
 
-            while True:
-                raw_data = self.conn.recv(4096)
-                if not raw_data:
-                    break 
-                
-                try:
-                    msg_text = raw_data.decode('utf-8')
-                except UnicodeDecodeError:
-                    logger.error(f"Unicode decode error from {self.user_id}")
-                    # Optionally notify client, but might be tricky if their side also has issues
-                    continue
-
-                parts = msg_text.split('|', 2)
-                if len(parts) != 3:
-                    logger.error(f"Invalid message format from {self.user_id}: {msg_text}")
-                    self.conn.sendall("SERVER_ERROR|Invalid message format. Use recipient|original_message|hamming_payload".encode('utf-8'))
-                    continue
-                
-                recipient, original_msg, hamming_payload = parts
-                
-                logger.info(f"Forwarding from {self.user_id} → {recipient} (Original: '{original_msg}')")
-                
-                corrupted_hamming, error_info = self.introduce_bit_errors(hamming_payload)
-                
-                if error_info['errors_introduced']:
-                    if error_info['error_type'] == 'single':
-                        logger.warning(f"🔴 Introduced SINGLE bit error at position {error_info['positions'][0]} for message to {recipient}")
-                    else: 
-                        logger.warning(f"🔴🔴 Introduced DOUBLE bit errors at positions {error_info['positions']} for message to {recipient}")
-                else:
-                    logger.info(f"✅ Clean transmission (no errors introduced) for message to {recipient}")
-
-                with lock:
-                    target_conn = clients.get(recipient)
-                
-                if target_conn:
-                    forward_payload = f"{original_msg}|{corrupted_hamming}"
-                    try:
-                        target_conn.sendall(forward_payload.encode('utf-8'))
-                        logger.info(f"✉️ Message from {self.user_id} delivered to {recipient}")
-                    except socket.error as e:
-                        logger.error(f"Socket error sending to {recipient}: {e}. Removing client.")
-                        # Assume client disconnected, remove them
-                        with lock:
-                            clients.pop(recipient, None)
-                        # Notify sender if possible, or just log
-                        self.conn.sendall(f"SERVER_ERROR|Failed to send message to '{recipient}', they might have disconnected.".encode('utf-8'))
-                else:
-                    logger.warning(f"❌ Recipient {recipient} not found or offline for message from {self.user_id}")
-                    self.conn.sendall(f"SERVER_ERROR|User '{recipient}' not found or offline.".encode('utf-8'))
+            if self.wire_format == 'framed':
+                self.serve_framed()
+            else:
+                self.serve_legacy()
                     
         except ConnectionResetError:
             logger.info(f"Client {self.user_id or self.addr} disconnected abruptly.")
@@ -147,7 +310,8 @@ class ClientHandler(threading.Thread):
             logger.error(f"Error handling client {self.user_id or self.addr}: {e}", exc_info=True) # exc_info for traceback
         finally:
             with lock:
-                if self.user_id and self.user_id in clients:
+                # A rejected duplicate must not unregister the client holding the ID
+                if self.user_id and clients.get(self.user_id) is self:
                     clients.pop(self.user_id, None)
             if self.conn:
                 self.conn.close()
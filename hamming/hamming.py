@@ -15,13 +15,14 @@ class HammingCode:
         if not bits or len(bits) % 8 != 0: return ""
         return ''.join(chr(int(bits[i:i+8], 2)) for i in range(0, len(bits), 8))
     
-    def encode(self, message):
+    def encode(self, message, secded=False):
+        """secded=True appends an overall parity bit so double errors are detected"""
         data_bits = self._text_to_bits(message)
         m = len(data_bits)
         r = self._parity_bits_needed(m)
         n = m + r
         
-        if m == 0: return '0' * r
+        if m == 0: return '0' * (r + secded)
         
         # Create code array
         code = ['0'] * n
@@ -42,9 +43,16 @@ class HammingCode:
                     parity ^= int(code[check_pos - 1])
             code[parity_pos - 1] = str(parity)
         
+        if secded:
+            code.append(str(code.count('1') % 2))
         return ''.join(code)
     
-    def decode(self, received_code):
+    def decode(self, received_code, secded=False):
+        """secded must match encode(); double errors are then reported, not miscorrected"""
+        overall_parity = 0
+        if secded:
+            overall_parity = received_code.count('1') % 2
+            received_code = received_code[:-1]
         n = len(received_code)
         if n == 0: return "", "No data"
         
@@ -73,7 +81,12 @@ class HammingCode:
         corrected = list(received_code)
         error_msg = "No error detected"
         
-        if syndrome > 0:
+        if secded and syndrome > 0 and not overall_parity:
+            # Syndrome set but overall parity even: two bits flipped
+            return "", f"Double error detected - NOT CORRECTABLE (syndrome={syndrome})"
+        if secded and syndrome == 0 and overall_parity:
+            error_msg = f"Error at position {n + 1} (overall parity) - CORRECTED"
+        elif syndrome > 0:
             if syndrome <= n:
                 # Correct the error
                 corrected[syndrome - 1] = '1' if corrected[syndrome - 1] == '0' else '0'
@@ -133,4 +146,12 @@ if __name__ == "__main__":
             double_error = hc.introduce_error(double_error, 4)
             print(f"With 2 errors:     {double_error} (flipped bits 2,4)")
             decoded_bad, status = hc.decode(double_error)
-            print(f"Decode attempt:    '{decoded_bad}' - {status}")
\ No newline at end of file
+            print(f"Decode attempt:    '{decoded_bad}' - {status}")
+            
+            # SECDED: the extra overall parity bit tells the two cases apart
+            extended = hc.encode(msg, secded=True)
+            double_error = hc.introduce_error(hc.introduce_error(extended, 2), 4)
+            decoded_bad, status = hc.decode(double_error, secded=True)
+            print(f"SECDED, 2 errors:  '{decoded_bad}' - {status}")
+            decoded_fixed, status = hc.decode(hc.introduce_error(extended, 3), secded=True)
+            print(f"SECDED, 1 error:   '{decoded_fixed}' - {status}")
\ No newline at end of file